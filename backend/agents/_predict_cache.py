@@ -0,0 +1,112 @@
+"""
+Prediction Cache
+Async LRU cache with request deduplication for DemandPredictorAgent.predict()
+"""
+
+import asyncio
+import functools
+import hashlib
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Awaitable, Callable, Dict, Tuple
+
+MAX_ENTRIES = 1024
+TTL_TODAY_SECONDS = 30 * 60  # Same-day (or past) services: context still moving
+TTL_FUTURE_SECONDS = 24 * 60 * 60  # Future services: stable for a day
+
+
+def make_key(restaurant_id: str, service_date: date, service_type) -> bytes:
+    """Build SHA256 cache key from (restaurant_id, service_date, service_type)"""
+    service_type_str = service_type.value if hasattr(service_type, "value") else str(service_type)
+    raw = f"{restaurant_id}|{service_date.isoformat()}|{service_type_str}"
+    return hashlib.sha256(raw.encode("utf-8")).digest()
+
+
+def ttl_for(service_date: date) -> int:
+    """Shorter TTL for today/past dates, longer for future dates"""
+    return TTL_FUTURE_SECONDS if service_date > date.today() else TTL_TODAY_SECONDS
+
+
+class PredictCache:
+    """
+    LRU cache of prediction futures
+
+    Stores an asyncio.Future (not the result) on miss, so concurrent duplicate
+    requests await the same computation instead of running it twice.
+    Lookup and insertion have no await point in between, so they are atomic
+    on the event loop without an explicit lock. Failures and results flagged
+    "degraded" (built from a fallback path) are not kept.
+    """
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[bytes, Tuple[float, asyncio.Future]]" = OrderedDict()
+
+    async def get_or_compute(
+        self,
+        key: bytes,
+        ttl: int,
+        compute: Callable[[], Awaitable[Dict]]
+    ) -> Dict:
+        """Return cached result for key, or run compute() once and cache it"""
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, future = entry
+            if expires_at > now:
+                self._entries.move_to_end(key)
+                return await asyncio.shield(future)
+            del self._entries[key]
+
+        future = asyncio.get_running_loop().create_future()
+        self._entries[key] = (now + ttl, future)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+        try:
+            result = await compute()
+        except BaseException as e:
+            # Don't cache failures; propagate to any deduplicated waiters
+            if self._entries.get(key, (None, None))[1] is future:
+                del self._entries[key]
+            if not future.done():
+                if isinstance(e, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(e)
+                    future.exception()  # Mark retrieved when nobody else is waiting
+            raise
+        if result.get("degraded"):
+            # Fallback result after a transient failure: share it with waiters, don't pin it
+            if self._entries.get(key, (None, None))[1] is future:
+                del self._entries[key]
+        if not future.done():
+            future.set_result(result)
+        return result
+
+    def clear(self) -> None:
+        """Drop all cached predictions"""
+        self._entries.clear()
+
+
+# Singleton instance
+_predict_cache = PredictCache()
+
+
+def get_predict_cache() -> PredictCache:
+    """Get prediction cache singleton"""
+    return _predict_cache
+
+
+def cached_prediction(func):
+    """Decorator for DemandPredictorAgent.predict(self, request)"""
+    @functools.wraps(func)
+    async def wrapper(self, request):
+        key = make_key(request.restaurant_id, request.service_date, request.service_type)
+        return await _predict_cache.get_or_compute(
+            key,
+            ttl_for(request.service_date),
+            lambda: func(self, request)
+        )
+    return wrapper
@@ -4,46 +4,212 @@ Predicts restaurant covers based on patterns, events, weather
 """
 
 import asyncio
+import logging
 from datetime import datetime, date, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+from bisect import bisect_left
+from itertools import accumulate
 import uuid
 import random
 import os
 from pathlib import Path
 
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Optional: pure NumPy path is used without Numba
+    njit = None
+
 from ..models.schemas import (
     PredictionRequest,
     Pattern,
     ServiceType
 )
 from .reasoning_engine import get_reasoning_engine
+from .staff_recommender import StaffRecommenderAgent
+from ._predict_cache import cached_prediction
+from ..utils.debug_log import write_debug_log as _write_debug_log
+from ..utils.qdrant_client import qdrant_connection_kwargs
+from ..utils.pattern_batcher import PatternBatcher
 from mistralai import Mistral
 from qdrant_client import QdrantClient
-from qdrant_client.models import Filter, FieldCondition, MatchValue
+from qdrant_client.models import (
+    Filter,
+    FieldCondition,
+    MatchValue,
+    QueryRequest,
+    SearchParams,
+    QuantizationSearchParams,
+)
 
+logger = logging.getLogger(__name__)
 
-def get_debug_log_path() -> str | None:
-    """Get debug log path from environment or use relative path.
-    Returns None if file logging is disabled (for Docker/production)."""
-    if os.getenv("DISABLE_FILE_LOGGING", "").lower() in ("true", "1", "yes"):
-        return None
-    return os.getenv("DEBUG_LOG_PATH", str(Path(__file__).parent.parent.parent / "debug.log"))
+# Max inputs per Mistral embeddings call
+EMBEDDING_BATCH_SIZE = 50
 
+# Pattern count from which the JIT kernel beats NumPy's per-call overhead
+NUMBA_MIN_PATTERNS = 64
 
-def _write_debug_log(message: str) -> None:
-    """Write to debug log file if file logging is enabled."""
-    debug_log_path = get_debug_log_path()
-    if debug_log_path is None:
-        return
-    try:
-        with open(debug_log_path, "a", encoding="utf-8") as f:
-            f.write(f"{message} - {datetime.now()}\n")
-            f.flush()
-    except Exception:
-        pass  # Silently ignore file logging errors in production
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def _weighted_sums_jit(covers, similarities):
+        """Fused single-pass (sum(covers * similarities), sum(similarities))"""
+        weighted_sum = 0.0
+        total_weight = 0.0
+        for i in range(similarities.shape[0]):
+            weighted_sum += covers[i] * similarities[i]
+            total_weight += similarities[i]
+        return weighted_sum, total_weight
+else:
+    _weighted_sums_jit = None
 
+# Day names indexed by date.weekday() (locale-independent, matches seed data)
+_WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
 
-from .staff_recommender import StaffRecommenderAgent
+# Mock holidays keyed by (month, day)
+_MOCK_HOLIDAY_NAMES = {
+    (12, 24): "Christmas Eve",
+    (12, 25): "Christmas",
+    (12, 31): "New Year's Eve",
+    (1, 1): "New Year's Day",
+    (7, 14): "Bastille Day",
+    (11, 11): "Veterans Day",
+    (5, 1): "Labor Day",
+}
+_MOCK_HOLIDAYS = frozenset(_MOCK_HOLIDAY_NAMES)
+
+
+# Mock event pools (read-only, shared across calls)
+_EVENT_TYPES = (
+    {
+        "type": "Concert",
+        "names": ("Coldplay", "Taylor Swift", "Ed Sheeran", "Beyonce"),
+        "attendance_range": (30000, 60000),
+        "distance_range": (1.5, 5.0),
+        "impact": "high"
+    },
+    {
+        "type": "Sports Match",
+        "names": ("PSG vs Marseille", "France vs England", "Champions League Final"),
+        "attendance_range": (40000, 80000),
+        "distance_range": (2.0, 6.0),
+        "impact": "high"
+    },
+    {
+        "type": "Theater Show",
+        "names": ("Hamilton", "Les Miserables", "Phantom of the Opera"),
+        "attendance_range": (1000, 3000),
+        "distance_range": (0.5, 2.0),
+        "impact": "medium"
+    },
+    {
+        "type": "Conference",
+        "names": ("Tech Summit", "Marketing Expo", "Healthcare Forum"),
+        "attendance_range": (500, 2000),
+        "distance_range": (0.2, 1.5),
+        "impact": "medium"
+    }
+)
+
+# Mock weather conditions with probabilities
+_WEATHER_CONDITIONS = (
+    ("Clear", 0.4),
+    ("Partly Cloudy", 0.3),
+    ("Cloudy", 0.15),
+    ("Rain", 0.10),
+    ("Heavy Rain", 0.03),
+    ("Snow", 0.02)
+)
+_WEATHER_NAMES = tuple(name for name, _ in _WEATHER_CONDITIONS)
+_WEATHER_CDF = tuple(accumulate(prob for _, prob in _WEATHER_CONDITIONS))
+
+# Precipitation % range per condition (None = dry)
+_PRECIPITATION_RANGES = {
+    "Clear": None,
+    "Partly Cloudy": (0, 10),
+    "Cloudy": (10, 30),
+    "Rain": (40, 70),
+    "Heavy Rain": (70, 100),
+    "Snow": (30, 60)
+}
+
+
+@lru_cache(maxsize=512)
+def _mock_events_for(ordinal: int, is_weekend: bool) -> Tuple[Dict, ...]:
+    """Generate realistic mock events for a date ordinal (memoized)"""
+    events = []
+
+    # Local RNG seeded with date for deterministic, thread-safe results
+    rng = random.Random(ordinal)
+
+    # Weekend = higher chance of events
+    event_probability = 0.7 if is_weekend else 0.3
+
+    if rng.random() < event_probability:
+        event_type = rng.choice(_EVENT_TYPES)
+
+        event = {
+            "type": event_type["type"],
+            "name": rng.choice(event_type["names"]),
+            "distance_km": round(rng.uniform(*event_type["distance_range"]), 1),
+            "expected_attendance": rng.randint(*event_type["attendance_range"]),
+            "start_time": "20:00" if event_type["type"] in ["Concert", "Theater Show"] else "19:00",
+            "impact": event_type["impact"]
+        }
+
+        events.append(event)
+
+        # 20% chance of second event on weekends
+        if is_weekend and rng.random() < 0.2:
+            second_type = rng.choice([t for t in _EVENT_TYPES if t != event_type])
+            second_event = {
+                "type": second_type["type"],
+                "name": rng.choice(second_type["names"]),
+                "distance_km": round(rng.uniform(*second_type["distance_range"]), 1),
+                "expected_attendance": rng.randint(*second_type["attendance_range"]),
+                "start_time": "21:00",
+                "impact": second_type["impact"]
+            }
+            events.append(second_event)
+
+    return tuple(events)
+
+
+@lru_cache(maxsize=512)
+def _mock_weather_for(ordinal: int) -> Dict:
+    """Generate realistic mock weather for a date ordinal (memoized)"""
+    rng = random.Random(ordinal + 1000)
+
+    # Binary search on the precomputed CDF (first condition with rand <= cumulative)
+    idx = bisect_left(_WEATHER_CDF, rng.random())
+    selected_condition = _WEATHER_NAMES[idx] if idx < len(_WEATHER_NAMES) else "Clear"
+
+    # Temperature varies by month
+    month = date.fromordinal(ordinal).month
+    if month in [12, 1, 2]:
+        temp_range = (0, 10)
+    elif month in [3, 4, 5]:
+        temp_range = (10, 20)
+    elif month in [6, 7, 8]:
+        temp_range = (20, 30)
+    else:
+        temp_range = (10, 20)
+
+    temperature = rng.randint(*temp_range)
+
+    precip_range = _PRECIPITATION_RANGES[selected_condition]
+    precipitation = rng.randint(*precip_range) if precip_range else 0
+
+    wind_speed = rng.randint(5, 25)
+
+    return {
+        "condition": selected_condition,
+        "temperature": temperature,
+        "precipitation": precipitation,
+        "wind_speed": wind_speed
+    }
 
 
 class DemandPredictorAgent:
@@ -59,10 +225,17 @@ class DemandPredictorAgent:
     def __init__(self):
         """Initialize predictor agent"""
         self.staff_recommender = StaffRecommenderAgent()
+        self.reasoning = get_reasoning_engine()
         
         # Initialize Qdrant client
         self.qdrant_client = None
         self.mistral_client = None
+        # HNSW query-time beam width (recall/latency knob, tunable at runtime)
+        self.ef_search = int(os.getenv("QDRANT_HNSW_EF", "64"))
+        # SQ8 (int8 scalar quantization) on the collection: rescore with FP32
+        self.enable_sq8 = os.getenv("ENABLE_SQ8", "").lower() in ("true", "1", "yes")
+        # Concurrent predictions share one query_batch_points round-trip
+        self._pattern_batcher = PatternBatcher(self._search_qdrant_batch)
         self._init_vector_clients()
     
     def _init_vector_clients(self):
@@ -91,7 +264,8 @@ class DemandPredictorAgent:
                 try:
                     self.qdrant_client = QdrantClient(
                         url=qdrant_url,
-                        api_key=qdrant_api_key
+                        api_key=qdrant_api_key,
+                        **qdrant_connection_kwargs()
                     )
                     # Test connection by getting collections
                     collections = self.qdrant_client.get_collections()
@@ -126,29 +300,33 @@ class DemandPredictorAgent:
             self.qdrant_client = None
             self.mistral_client = None
     
+    @cached_prediction
     async def predict(self, request: PredictionRequest) -> Dict:
         """
         Main prediction method
         
+        Results are cached per (restaurant_id, service_date, service_type);
+        concurrent identical requests share a single computation.
+        
         Args:
             request: PredictionRequest with restaurant_id, service_date, service_type
             
         Returns:
             Dict with predicted_covers, confidence, patterns, reasoning
         """
-        import logging
-        logger = logging.getLogger("uvicorn")
-        
-        logger.info(f"[PREDICT] Starting prediction for {request.restaurant_id} on {request.service_date}")
+        logger.info("[PREDICT] Starting prediction for %s on %s", request.restaurant_id, request.service_date)
         _write_debug_log(f"[PREDICT] Starting prediction for {request.restaurant_id}")
-        logger.info(f"[PREDICT] Qdrant client initialized: {self.qdrant_client is not None}, Mistral client initialized: {self.mistral_client is not None}")
+        logger.debug(
+            "[PREDICT] Qdrant client initialized: %s, Mistral client initialized: %s",
+            self.qdrant_client is not None, self.mistral_client is not None
+        )
         
         # Step 1: Fetch external context
         context = await self._fetch_external_context(request)
         
         # Step 2: Find similar patterns
-        similar_patterns = await self._find_similar_patterns(request, context)
-        logger.info(f"[PREDICT] Found {len(similar_patterns)} similar patterns")
+        similar_patterns, patterns_degraded = await self._find_similar_patterns(request, context)
+        logger.info("[PREDICT] Found %d similar patterns", len(similar_patterns))
         
         # Step 3: Calculate prediction
         prediction = await self._calculate_prediction(similar_patterns, context)
@@ -161,8 +339,7 @@ class DemandPredictorAgent:
         prediction["staff_recommendation"] = staff_result
         
         # Step 5: Generate reasoning with Claude
-        reasoning_engine = get_reasoning_engine()
-        reasoning = await reasoning_engine.generate_reasoning(
+        reasoning = await self.reasoning.generate_reasoning(
             predicted_covers=prediction["predicted_covers"],
             confidence=prediction["confidence"],
             patterns=similar_patterns,
@@ -173,8 +350,22 @@ class DemandPredictorAgent:
         
         # Combine prediction + reasoning
         prediction["reasoning"] = reasoning
+        # Built from a fallback after a transient failure: served, but never cached
+        prediction["degraded"] = patterns_degraded or reasoning.get("fallback", False)
         
         return prediction
+
+    async def predict_many(self, requests: List[PredictionRequest]) -> List[Dict]:
+        """
+        Run several predictions concurrently
+        
+        Args:
+            requests: List of PredictionRequest (e.g. several dates or restaurants)
+            
+        Returns:
+            List of prediction dicts, in the same order as requests
+        """
+        return await asyncio.gather(*(self.predict(r) for r in requests))
     
     async def _fetch_external_context(self, request: PredictionRequest) -> Dict:
         """
@@ -184,9 +375,10 @@ class DemandPredictorAgent:
         Phase 2: Integrate PredictHQ, Weather API
         """
         # Determine day type
-        day_of_week = request.service_date.strftime("%A")
-        is_weekend = request.service_date.weekday() in [5, 6]
-        is_friday = request.service_date.weekday() == 4
+        weekday = request.service_date.weekday()
+        day_of_week = _WEEKDAYS[weekday]
+        is_weekend = weekday >= 5
+        is_friday = weekday == 4
         
         # Generate realistic events based on day
         events = self._generate_mock_events(request.service_date, is_weekend)
@@ -209,153 +401,20 @@ class DemandPredictorAgent:
     
     def _generate_mock_events(self, service_date: date, is_weekend: bool) -> List[Dict]:
         """Generate realistic mock events based on date"""
-        events = []
-        
-        # Seed random with date for deterministic results
-        random.seed(service_date.toordinal())
-        
-        # Weekend = higher chance of events
-        event_probability = 0.7 if is_weekend else 0.3
-        
-        if random.random() < event_probability:
-            event_types = [
-                {
-                    "type": "Concert",
-                    "names": ["Coldplay", "Taylor Swift", "Ed Sheeran", "Beyonce"],
-                    "attendance_range": (30000, 60000),
-                    "distance_range": (1.5, 5.0),
-                    "impact": "high"
-                },
-                {
-                    "type": "Sports Match",
-                    "names": ["PSG vs Marseille", "France vs England", "Champions League Final"],
-                    "attendance_range": (40000, 80000),
-                    "distance_range": (2.0, 6.0),
-                    "impact": "high"
-                },
-                {
-                    "type": "Theater Show",
-                    "names": ["Hamilton", "Les Miserables", "Phantom of the Opera"],
-                    "attendance_range": (1000, 3000),
-                    "distance_range": (0.5, 2.0),
-                    "impact": "medium"
-                },
-                {
-                    "type": "Conference",
-                    "names": ["Tech Summit", "Marketing Expo", "Healthcare Forum"],
-                    "attendance_range": (500, 2000),
-                    "distance_range": (0.2, 1.5),
-                    "impact": "medium"
-                }
-            ]
-            
-            event_type = random.choice(event_types)
-            
-            event = {
-                "type": event_type["type"],
-                "name": random.choice(event_type["names"]),
-                "distance_km": round(random.uniform(*event_type["distance_range"]), 1),
-                "expected_attendance": random.randint(*event_type["attendance_range"]),
-                "start_time": "20:00" if event_type["type"] in ["Concert", "Theater Show"] else "19:00",
-                "impact": event_type["impact"]
-            }
-            
-            events.append(event)
-            
-            # 20% chance of second event on weekends
-            if is_weekend and random.random() < 0.2:
-                second_type = random.choice([t for t in event_types if t != event_type])
-                second_event = {
-                    "type": second_type["type"],
-                    "name": random.choice(second_type["names"]),
-                    "distance_km": round(random.uniform(*second_type["distance_range"]), 1),
-                    "expected_attendance": random.randint(*second_type["attendance_range"]),
-                    "start_time": "21:00",
-                    "impact": second_type["impact"]
-                }
-                events.append(second_event)
-        
-        return events
+        # Copy so callers can't mutate the memoized events
+        return [dict(e) for e in _mock_events_for(service_date.toordinal(), is_weekend)]
     
     def _generate_mock_weather(self, service_date: date, is_weekend: bool) -> Dict:
         """Generate realistic mock weather based on date"""
-        random.seed(service_date.toordinal() + 1000)
-        
-        conditions = [
-            ("Clear", 0.4),
-            ("Partly Cloudy", 0.3),
-            ("Cloudy", 0.15),
-            ("Rain", 0.10),
-            ("Heavy Rain", 0.03),
-            ("Snow", 0.02)
-        ]
-        
-        rand = random.random()
-        cumulative = 0
-        selected_condition = "Clear"
-        
-        for condition, prob in conditions:
-            cumulative += prob
-            if rand <= cumulative:
-                selected_condition = condition
-                break
-        
-        # Temperature varies by month
-        month = service_date.month
-        if month in [12, 1, 2]:
-            temp_range = (0, 10)
-        elif month in [3, 4, 5]:
-            temp_range = (10, 20)
-        elif month in [6, 7, 8]:
-            temp_range = (20, 30)
-        else:
-            temp_range = (10, 20)
-        
-        temperature = random.randint(*temp_range)
-        
-        precipitation = {
-            "Clear": 0,
-            "Partly Cloudy": random.randint(0, 10),
-            "Cloudy": random.randint(10, 30),
-            "Rain": random.randint(40, 70),
-            "Heavy Rain": random.randint(70, 100),
-            "Snow": random.randint(30, 60)
-        }.get(selected_condition, 0)
-        
-        wind_speed = random.randint(5, 25)
-        
-        return {
-            "condition": selected_condition,
-            "temperature": temperature,
-            "precipitation": precipitation,
-            "wind_speed": wind_speed
-        }
+        return dict(_mock_weather_for(service_date.toordinal()))
     
     def _is_mock_holiday(self, service_date: date) -> bool:
         """Check if date is a holiday"""
-        holidays = [
-            (12, 24), (12, 25),  # Christmas Eve & Day
-            (12, 31), (1, 1),    # New Year's
-            (7, 14),  # Bastille Day
-            (11, 11), # Veterans Day
-            (5, 1),   # Labor Day
-        ]
-        
-        return (service_date.month, service_date.day) in holidays
+        return (service_date.month, service_date.day) in _MOCK_HOLIDAYS
     
     def _get_holiday_name(self, service_date: date) -> Optional[str]:
         """Get holiday name if date is a holiday"""
-        holidays = {
-            (12, 24): "Christmas Eve",
-            (12, 25): "Christmas",
-            (12, 31): "New Year's Eve",
-            (1, 1): "New Year's Day",
-            (7, 14): "Bastille Day",
-            (11, 11): "Veterans Day",
-            (5, 1): "Labor Day",
-        }
-        
-        return holidays.get((service_date.month, service_date.day))
+        return _MOCK_HOLIDAY_NAMES.get((service_date.month, service_date.day))
     
     def _build_context_string(self, request: PredictionRequest, context: Dict) -> str:
         """
@@ -371,8 +430,8 @@ class DemandPredictorAgent:
         # Format date as YYYY-MM-DD string (same as seed_qdrant.py)
         date_str = request.service_date.strftime("%Y-%m-%d")
         
-        # Get service type as string (handle enum)
-        service_type_str = request.service_type.value if hasattr(request.service_type, 'value') else str(request.service_type)
+        # Service type is already the plain string value
+        service_type_str = request.service_type
         
         # Use realistic values based on day_type to match Qdrant patterns
         # Weekend/holiday = higher occupancy, weekday = lower
@@ -405,96 +464,120 @@ Events nearby: {events_str}
 Holiday: {context.get('holiday_name', 'None') if context.get('is_holiday') else 'None'}"""
 
     async def _get_embedding(self, text: str) -> List[float]:
+        """Get a single embedding from Mistral (async-safe)"""
+        embeddings = await self._get_embeddings([text])
+        return embeddings[0]
+
+    async def _get_embeddings(self, texts: List[str]) -> List[List[float]]:
         """
-        Get embedding from Mistral (async-safe)
+        Get embeddings for several texts from Mistral (async-safe)
         
-        Uses asyncio.to_thread() to run the synchronous API call in a thread pool,
-        preventing blocking of the event loop.
+        Texts are sent in batches of EMBEDDING_BATCH_SIZE per API call, and the
+        batches run concurrently. Uses asyncio.to_thread() to run the synchronous
+        API calls in a thread pool, preventing blocking of the event loop.
         """
-        def _sync_get_embedding() -> List[float]:
+        def _sync_get_embeddings(batch: List[str]) -> List[List[float]]:
             """Synchronous embedding call to be run in thread pool"""
             response = self.mistral_client.embeddings.create(
                 model="mistral-embed",
-                inputs=[text]
+                inputs=batch
             )
-            return response.data[0].embedding
+            return [item.embedding for item in response.data]
         
-        # Run synchronous call in thread pool to avoid blocking event loop
-        return await asyncio.to_thread(_sync_get_embedding)
+        batches = [
+            texts[i:i + EMBEDDING_BATCH_SIZE]
+            for i in range(0, len(texts), EMBEDDING_BATCH_SIZE)
+        ]
+        # Run synchronous calls in thread pool to avoid blocking event loop
+        results = await asyncio.gather(
+            *(asyncio.to_thread(_sync_get_embeddings, batch) for batch in batches)
+        )
+        return [embedding for batch_result in results for embedding in batch_result]
+
+    def _search_params(self) -> SearchParams:
+        """Build Qdrant search params (HNSW beam width + optional SQ8 rescoring)"""
+        quantization = None
+        if self.enable_sq8:
+            # Search the int8 vectors, then re-rank top-k with original FP32 vectors
+            quantization = QuantizationSearchParams(rescore=True, oversampling=2.0)
+        return SearchParams(hnsw_ef=self.ef_search, quantization=quantization)
 
     async def _search_qdrant(self, embedding: List[float], service_type: str, limit: int = 5) -> List:
+        """Search Qdrant for similar patterns (coalesced with concurrent searches by the batcher)"""
+        return await self._pattern_batcher.submit(embedding, service_type, limit)
+
+    async def _search_qdrant_batch(
+        self,
+        queries: List[Tuple[List[float], str]],
+        limit: int = 5
+    ) -> List[List]:
         """
-        Search Qdrant for similar patterns using query_points (new API) - async-safe
+        Search Qdrant for several (embedding, service_type) queries at once - async-safe
         
-        Uses asyncio.to_thread() to run the synchronous Qdrant call in a thread pool,
-        preventing blocking of the event loop.
-        """
-        import logging
-        logger = logging.getLogger("uvicorn")
+        Uses query_batch_points: one HTTP round-trip for all queries instead of
+        one query_points call each. Runs the synchronous client in a thread pool
+        via asyncio.to_thread() to avoid blocking the event loop.
         
-        def _sync_search_qdrant() -> List:
-            """Synchronous Qdrant search to be run in thread pool"""
+        Returns:
+            One list of hits per query, in the same order as queries
+        """
+        def _sync_search_qdrant_batch() -> List[List]:
+            """Synchronous batched Qdrant search to be run in thread pool"""
+            search_params = self._search_params()
             try:
-                # Build filter for service type
-                search_filter = Filter(
-                    must=[
-                        FieldCondition(
-                            key="service_type",
-                            match=MatchValue(value=service_type)
+                responses = self.qdrant_client.query_batch_points(
+                    collection_name="fb_patterns",
+                    requests=[
+                        QueryRequest(
+                            query=embedding,
+                            filter=Filter(
+                                must=[
+                                    FieldCondition(
+                                        key="service_type",
+                                        match=MatchValue(value=service_type)
+                                    )
+                                ]
+                            ),
+                            params=search_params,
+                            limit=limit,
+                            with_payload=True
                         )
+                        for embedding, service_type in queries
                     ]
                 )
-                
-                # Use query_points method (new qdrant-client API v1.16.0+)
-                # query_points replaces the deprecated search() method
-                results = self.qdrant_client.query_points(
-                    collection_name="fb_patterns",
-                    query=embedding,  # query_points uses 'query' instead of 'query_vector'
-                    query_filter=search_filter,
-                    limit=limit,
-                    with_payload=True
-                )
-                
-                # query_points returns a QueryResponse, extract points
-                if hasattr(results, 'points'):
-                    return results.points
-                elif isinstance(results, list):
-                    return results
-                else:
-                    # Fallback: try to get points from response object
-                    return list(results) if results else []
+                return [response.points for response in responses]
                     
             except Exception as e:
-                # Try without filter if filter fails
-                logger.warning(f"[PATTERNS] Filter search failed: {e}, trying without filter")
+                # Try without filter if filter fails (e.g. missing payload index)
+                logger.warning("[PATTERNS] Filter search failed: %s, trying without filter", e)
                 _write_debug_log(f"[PATTERNS] Filter search failed: {e}, trying without filter")
                 try:
-                    results = self.qdrant_client.query_points(
+                    responses = self.qdrant_client.query_batch_points(
                         collection_name="fb_patterns",
-                        query=embedding,
-                        limit=limit * 2,  # Get more results to filter manually
-                        with_payload=True
+                        requests=[
+                            QueryRequest(
+                                query=embedding,
+                                params=search_params,
+                                limit=limit * 2,  # Get more results to filter manually
+                                with_payload=True
+                            )
+                            for embedding, _ in queries
+                        ]
                     )
-                    # Extract points from response
-                    if hasattr(results, 'points'):
-                        points = results.points
-                    elif isinstance(results, list):
-                        points = results
-                    else:
-                        points = list(results) if results else []
-                    
                     # Filter results manually by service_type
-                    filtered_results = [r for r in points if r.payload.get("service_type") == service_type]
-                    return filtered_results[:limit]
+                    return [
+                        [r for r in response.points if r.payload.get("service_type") == service_type][:limit]
+                        for response, (_, service_type) in zip(responses, queries)
+                    ]
                 except Exception as e2:
-                    logger.error(f"[PATTERNS] Query without filter also failed: {e2}")
+                    logger.error("[PATTERNS] Query without filter also failed: %s", e2)
                     _write_debug_log(f"[PATTERNS] Query without filter also failed: {e2}")
                     import traceback
                     _write_debug_log(f"[PATTERNS] Traceback: {traceback.format_exc()}")
                     raise e2
         
         # Run synchronous call in thread pool to avoid blocking event loop
-        return await asyncio.to_thread(_sync_search_qdrant)
+        return await asyncio.to_thread(_sync_search_qdrant_batch)
 
     def _qdrant_hit_to_pattern(self, hit) -> Pattern:
         """Convert Qdrant search hit to Pattern object"""
@@ -521,7 +604,8 @@ Holiday: {context.get('holiday_name', 'None') if context.get('is_holiday') else
         else:
             event_desc = f"Regular {payload.get('day_type', 'weekday')} service"
         
-        return Pattern(
+        # Trusted payload from our own collection: skip re-validation
+        return Pattern.model_construct(
             pattern_id=payload.get("pattern_id", f"pat_{hit.id}"),
             date=datetime.strptime(payload["date"], "%Y-%m-%d").date(),
             event_type=event_desc,
@@ -545,15 +629,15 @@ Holiday: {context.get('holiday_name', 'None') if context.get('is_holiday') else
         Generate mock patterns (fallback when Qdrant unavailable)
         Original Phase 1 logic preserved for resilience
         """
-        random.seed(request.service_date.toordinal() + 2000)
+        rng = random.Random(request.service_date.toordinal() + 2000)
         
         # Base covers vary by day type
         if context['day_type'] == 'weekend':
-            base_covers = random.randint(130, 160)
+            base_covers = rng.randint(130, 160)
         elif context['day_type'] == 'friday':
-            base_covers = random.randint(120, 145)
+            base_covers = rng.randint(120, 145)
         else:
-            base_covers = random.randint(100, 130)
+            base_covers = rng.randint(100, 130)
         
         # Adjust for events
         if context['events']:
@@ -570,18 +654,18 @@ Holiday: {context.get('holiday_name', 'None') if context.get('is_holiday') else
         if context['is_holiday']:
             holiday_name = context['holiday_name']
             if holiday_name in ["Christmas Eve", "Christmas"]:
-                base_covers = random.randint(40, 70)
+                base_covers = rng.randint(40, 70)
             elif holiday_name == "New Year's Eve":
-                base_covers = random.randint(180, 220)
+                base_covers = rng.randint(180, 220)
             elif holiday_name == "New Year's Day":
-                base_covers = random.randint(50, 80)
+                base_covers = rng.randint(50, 80)
         
         # Generate 3 patterns around this base
         patterns = []
         for i in range(3):
-            months_ago = random.randint(3, 12)
+            months_ago = rng.randint(3, 12)
             pattern_date = request.service_date - timedelta(days=30 * months_ago)
-            pattern_covers = base_covers + random.randint(-10, 10)
+            pattern_covers = base_covers + rng.randint(-10, 10)
             
             if context['events']:
                 event_desc = f"{context['events'][0]['type']} nearby"
@@ -592,12 +676,12 @@ Holiday: {context.get('holiday_name', 'None') if context.get('is_holiday') else
             else:
                 event_desc = f"Regular {context['day_type']} service"
             
-            pattern = Pattern(
+            pattern = Pattern.model_construct(
                 pattern_id=f"mock_{i+1:03d}",
                 date=pattern_date,
                 event_type=event_desc,
                 actual_covers=max(30, pattern_covers),
-                similarity=round(random.uniform(0.85, 0.95), 2),
+                similarity=round(rng.uniform(0.85, 0.95), 2),
                 metadata={
                     "day_of_week": context['day_of_week'],
                     "weather": context['weather']['condition'],
@@ -615,21 +699,24 @@ Holiday: {context.get('holiday_name', 'None') if context.get('is_holiday') else
         self, 
         request: PredictionRequest, 
         context: Dict
-    ) -> List[Pattern]:
+    ) -> Tuple[List[Pattern], bool]:
         """
         Find similar patterns using Qdrant vector search
         
-        Falls back to mock generation if Qdrant unavailable
+        Falls back to mock generation if Qdrant unavailable.
+        Returns (patterns, degraded): degraded is True when the Qdrant search
+        failed and mock patterns stand in for it.
         """
-        import logging
-        logger = logging.getLogger("uvicorn")
-        
+        degraded = False
         # Try Qdrant search first
         if self.qdrant_client and self.mistral_client:
             try:
                 _write_debug_log("[PATTERNS] Using Qdrant vector search")
                 logger.info("[PATTERNS] Using Qdrant vector search")
-                logger.info(f"[PATTERNS] Qdrant client available: {self.qdrant_client is not None}, Mistral client available: {self.mistral_client is not None}")
+                logger.debug(
+                    "[PATTERNS] Qdrant client available: %s, Mistral client available: %s",
+                    self.qdrant_client is not None, self.mistral_client is not None
+                )
                 
                 # Build context string (same format as seeded patterns)
                 context_str = self._build_context_string(request, context)
@@ -639,7 +726,7 @@ Holiday: {context.get('holiday_name', 'None') if context.get('is_holiday') else
                 embedding = await self._get_embedding(context_str)
                 
                 # Get service type as string and map to Qdrant values
-                service_type = request.service_type.value if hasattr(request.service_type, 'value') else str(request.service_type)
+                service_type = request.service_type
                 # Map brunch to breakfast (closest match in Qdrant patterns)
                 if service_type == "brunch":
                     service_type = "breakfast"
@@ -649,26 +736,30 @@ Holiday: {context.get('holiday_name', 'None') if context.get('is_holiday') else
                 
                 if hits:
                     patterns = [self._qdrant_hit_to_pattern(hit) for hit in hits]
-                    logger.info(f"[PATTERNS] Found {len(patterns)} patterns from Qdrant")
+                    logger.info("[PATTERNS] Found %d patterns from Qdrant", len(patterns))
                     _write_debug_log(f"[PATTERNS] Found {len(patterns)} patterns, top score: {patterns[0].similarity}")
-                    return patterns
+                    return patterns, False
                 else:
                     logger.warning("[PATTERNS] No Qdrant results, falling back to mock")
                     _write_debug_log("[PATTERNS] No Qdrant results, using fallback")
                     
             except Exception as e:
-                logger.error(f"[PATTERNS] Qdrant search failed: {e}")
+                degraded = True
+                logger.error("[PATTERNS] Qdrant search failed: %s", e)
                 _write_debug_log(f"[PATTERNS] Qdrant error: {e}, using fallback")
         
         # FALLBACK: Generate mock patterns (existing logic)
         _write_debug_log("[PATTERNS] Using mock pattern generation (fallback)")
         logger.info("[PATTERNS] Using mock pattern generation (fallback)")
-        logger.warning(f"[PATTERNS] Qdrant client: {self.qdrant_client is not None}, Mistral client: {self.mistral_client is not None}")
+        logger.warning(
+            "[PATTERNS] Qdrant client: %s, Mistral client: %s",
+            self.qdrant_client is not None, self.mistral_client is not None
+        )
         if not self.qdrant_client:
             logger.warning("[PATTERNS] Qdrant client not initialized - check QDRANT_URL and QDRANT_API_KEY")
         if not self.mistral_client:
             logger.warning("[PATTERNS] Mistral client not initialized - check MISTRAL_API_KEY")
-        return await self._generate_mock_patterns(request, context)
+        return await self._generate_mock_patterns(request, context), degraded
     
     async def _calculate_prediction(
         self,
@@ -689,9 +780,16 @@ Holiday: {context.get('holiday_name', 'None') if context.get('is_holiday') else
                 }
             }
         
-        # Weighted average calculation
-        total_weight = sum(p.similarity for p in patterns)
-        weighted_sum = sum(p.actual_covers * p.similarity for p in patterns)
+        # Weighted average calculation (single pass, vectorized dot product)
+        # Read pattern attributes once; reused for the accuracy estimate below
+        pairs = [(p.similarity, p.actual_covers) for p in patterns]
+        data = np.array(pairs, dtype=np.float64)
+        similarities, covers = data[:, 0], data[:, 1]
+        if _weighted_sums_jit is not None and len(patterns) >= NUMBA_MIN_PATTERNS:
+            weighted_sum, total_weight = _weighted_sums_jit(covers, similarities)
+        else:
+            total_weight = float(similarities.sum())
+            weighted_sum = float(np.dot(covers, similarities))
         predicted_covers = int(weighted_sum / total_weight)
         
         # Average similarity = confidence proxy
@@ -699,7 +797,9 @@ Holiday: {context.get('holiday_name', 'None') if context.get('is_holiday') else
         confidence = round(avg_similarity, 2)
         
         # Calculate accuracy metrics
-        accuracy_metrics = self._estimate_accuracy_metrics(patterns, predicted_covers)
+        accuracy_metrics = self._estimate_accuracy_metrics(
+            patterns, predicted_covers, covers=[c for _, c in pairs]
+        )
         
         return {
             "predicted_covers": predicted_covers,
@@ -709,7 +809,12 @@ Holiday: {context.get('holiday_name', 'None') if context.get('is_holiday') else
             "accuracy_metrics": accuracy_metrics
         }
     
-    def _estimate_accuracy_metrics(self, patterns: List[Pattern], predicted_covers: int) -> Dict:
+    def _estimate_accuracy_metrics(
+        self,
+        patterns: List[Pattern],
+        predicted_covers: int,
+        covers: Optional[List[int]] = None
+    ) -> Dict:
         """
         Estimate accuracy metrics based on pattern variance.
         
@@ -724,7 +829,8 @@ Holiday: {context.get('holiday_name', 'None') if context.get('is_holiday') else
             }
         
         # Calculate variance in similar patterns
-        covers = [p.actual_covers for p in patterns]
+        if covers is None:
+            covers = [p.actual_covers for p in patterns]
         mean_covers = sum(covers) / len(covers)
         
         # Estimate MAPE from pattern spread (proxy for prediction uncertainty)
@@ -6,6 +6,7 @@ Generates human-readable explanations for predictions using Claude AI
 from typing import Dict, List
 from datetime import date
 from anthropic import AsyncAnthropic
+import logging
 import os
 from dotenv import load_dotenv
 
@@ -14,6 +15,8 @@ load_dotenv()
 
 from ..models.schemas import Pattern
 
+logger = logging.getLogger(__name__)
+
 
 class ReasoningEngine:
     """
@@ -57,7 +60,7 @@ class ReasoningEngine:
         Returns:
             Dict with summary, confidence_factors, pattern insights
         """
-        print("  [REASONING] Generating explanation with Claude...")
+        logger.info("[REASONING] Generating explanation with Claude...")
         
         # Build prompt for Claude
         prompt = self._build_reasoning_prompt(
@@ -68,8 +71,7 @@ class ReasoningEngine:
             service_date=service_date,
             service_type=service_type
         )
-        # DEBUG: Print first 500 chars of prompt
-        print(f"  [REASONING] Prompt preview: {prompt[:500]}...")  # DEBUG
+        logger.debug("[REASONING] Prompt preview: %.500s...", prompt)
         
         # Call Claude API
         try:
@@ -88,8 +90,8 @@ class ReasoningEngine:
             # Extract reasoning from Claude's response
             reasoning_text = message.content[0].text
             
-            print(f"  [REASONING] OK - Generated {len(reasoning_text)} chars")
-            print(f"  [REASONING] Claude response preview: {reasoning_text[:200]}...")  # DEBUG
+            logger.info("[REASONING] OK - Generated %d chars", len(reasoning_text))
+            logger.debug("[REASONING] Claude response preview: %.200s...", reasoning_text)
             
             # Parse Claude's response into structured format
             reasoning = self._parse_reasoning(reasoning_text, patterns, context)
@@ -97,8 +99,8 @@ class ReasoningEngine:
             return reasoning
             
         except Exception as e:
-            print(f"  [REASONING] Error calling Claude: {e}")
-            print(f"  [REASONING] Using fallback reasoning")  # DEBUG
+            logger.warning("[REASONING] Error calling Claude: %s", e)
+            logger.debug("[REASONING] Using fallback reasoning")
             # Fallback to basic reasoning
             return self._fallback_reasoning(predicted_covers, confidence, patterns)
     
@@ -248,7 +250,8 @@ YOUR EXPLANATION:"""
                 "Day of week similarity",
                 "Service type match"
             ],
-            "patterns_used": patterns
+            "patterns_used": patterns,
+            "fallback": True  # Not part of the Reasoning schema; keeps it out of the predict cache
         }
 
 
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+Direct PostgreSQL access (asyncpg) for hot read paths.
+
+Optional: enabled when SUPABASE_DB_URL is set (Supavisor/pgbouncer pooler,
+port 6543). Routes fall back to the supabase-py client when the pool is absent.
+"""
+
+import logging
+import os
+from decimal import Decimal
+from typing import Any, List, Optional
+
+import asyncpg
+import orjson
+from fastapi import Response
+
+logger = logging.getLogger(__name__)
+
+PG_POOL_MIN_SIZE = 2
+PG_POOL_MAX_SIZE = 10
+
+_pool: Optional[asyncpg.Pool] = None
+
+
+def _json_encode(value: Any) -> str:
+    return orjson.dumps(value).decode()
+
+
+async def _init_connection(con: asyncpg.Connection) -> None:
+    # Decode json/jsonb columns (factors, similar_patterns) like PostgREST does,
+    # with orjson: these columns are parsed for every row read
+    for type_name in ("json", "jsonb"):
+        await con.set_type_codec(
+            type_name, encoder=_json_encode, decoder=orjson.loads, schema="pg_catalog"
+        )
+
+
+async def init_pg_pool() -> Optional[asyncpg.Pool]:
+    """Create the shared pool at startup (no-op if SUPABASE_DB_URL is unset)"""
+    global _pool
+    dsn = os.environ.get("SUPABASE_DB_URL")
+    if not dsn or _pool is not None:
+        return _pool
+    try:
+        _pool = await asyncpg.create_pool(
+            dsn=dsn,
+            min_size=PG_POOL_MIN_SIZE,
+            max_size=PG_POOL_MAX_SIZE,
+            statement_cache_size=0,  # Required behind Supavisor transaction mode
+            init=_init_connection,
+        )
+        logger.info("[DB] asyncpg pool ready")
+    except Exception as e:
+        logger.warning("[DB] asyncpg pool unavailable, using supabase-py: %s", e)
+        _pool = None
+    return _pool
+
+
+async def close_pg_pool() -> None:
+    """Close the shared pool at shutdown"""
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+
+
+def get_pg_pool() -> Optional[asyncpg.Pool]:
+    """FastAPI dependency: shared pool, or None when direct DB access is disabled"""
+    return _pool
+
+
+async def fetch_rows(pool: asyncpg.Pool, query: str, *args: Any) -> List[dict]:
+    """Run a query and return rows as dicts (same shape as PostgREST .data)"""
+    async with pool.acquire() as con:
+        records = await con.fetch(query, *args)
+    return [dict(r) for r in records]
+
+
+def _json_default(obj: Any) -> Any:
+    # NUMERIC/DECIMAL columns come back from asyncpg as Decimal
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def rows_response(data: Any) -> Response:
+    """
+    Serialize trusted DB rows straight to JSON.
+
+    Returning a Response bypasses FastAPI's response_model re-validation
+    (the route's response_model still documents the schema in OpenAPI).
+    """
+    return Response(
+        content=orjson.dumps(data, default=_json_default),
+        media_type="application/json",
+    )
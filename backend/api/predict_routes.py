@@ -0,0 +1,359 @@
+# -*- coding: utf-8 -*-
+"""
+Prediction API Routes
+Phase 1: /predict and /predict/batch
+"""
+
+import asyncio
+import logging
+import math
+import os
+import uuid
+from datetime import date
+
+import orjson
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
+
+from backend.models.schemas import (
+    PredictionRequest,
+    PredictionResponse,
+    BatchPredictionRequest,
+    Reasoning,
+    StaffRecommendation,
+    StaffDelta,
+    AccuracyMetrics,
+    ServiceType,
+    utc_now_iso,
+)
+from backend.agents.demand_predictor import get_demand_predictor
+from backend.api.prediction_store import store_prediction_for_feedback
+from backend.utils.debug_log import write_debug_log as _write_debug_log
+
+logger = logging.getLogger("uvicorn")
+
+router = APIRouter(tags=["predictions"])
+
+# Bound concurrent predictions (Claude / Mistral / Qdrant rate limits);
+# requests queue up to PREDICT_QUEUE_TIMEOUT_S, then get a 429
+PREDICT_CONCURRENCY = int(os.environ.get("PREDICT_CONCURRENCY", "8"))
+PREDICT_QUEUE_TIMEOUT_S = float(os.environ.get("PREDICT_QUEUE_TIMEOUT_S", "10"))
+PREDICT_RETRY_AFTER_S = 5
+
+_predict_semaphore = asyncio.Semaphore(PREDICT_CONCURRENCY)
+
+# Fallback staffing when the predictor result lacks a role
+_DEFAULT_STAFF_DELTAS = {
+    "servers": {"recommended": 7, "usual": 7, "delta": 0},
+    "hosts": {"recommended": 2, "usual": 2, "delta": 0},
+    "kitchen": {"recommended": 3, "usual": 3, "delta": 0},
+}
+
+# Static JSON skeletons for /predict/batch: each prediction is serialized once
+# by pydantic-core and spliced in as bytes (no dict round-trip, no re-encoding)
+_BATCH_ITEM_PREFIX = b'{"date":%b,'
+_BATCH_RESPONSE = b'{"predictions":[%b],"count":%d,"service_type":%b,"restaurant_id":%b}'
+
+
+async def _predict_bounded(predictor, request: PredictionRequest) -> dict:
+    """Run predictor.predict() under the concurrency limit (429 if the queue wait times out)"""
+    try:
+        await asyncio.wait_for(_predict_semaphore.acquire(), PREDICT_QUEUE_TIMEOUT_S)
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many predictions in progress, retry shortly",
+            headers={"Retry-After": str(PREDICT_RETRY_AFTER_S)},
+        )
+    try:
+        return await predictor.predict(request)
+    finally:
+        _predict_semaphore.release()
+
+
+# Body is parsed by hand (see create_prediction): document it for OpenAPI
+_PREDICTION_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {
+                "schema": PredictionRequest.model_json_schema(
+                    ref_template="#/components/schemas/{model}"
+                )
+            }
+        },
+    }
+}
+
+
+@router.post("/predict", response_model=PredictionResponse, openapi_extra=_PREDICTION_REQUEST_BODY)
+async def create_prediction(http_request: Request):
+    """
+    Create a staffing prediction
+    
+    Phase 1: Basic prediction (mocked data)
+    Phase 2: Full integration (real patterns, APIs)
+    """
+    # Parse + validate the raw body in one pydantic-core (Rust) pass instead of
+    # Starlette's json.loads followed by FastAPI's model validation
+    try:
+        request = PredictionRequest.model_validate_json(await http_request.body())
+    except ValidationError as e:
+        # Same error contract as FastAPI's own body validation (loc starts with "body")
+        raise RequestValidationError(
+            [{**err, "loc": ("body", *err["loc"])} for err in e.errors(include_url=False)]
+        )
+    prediction = await _build_prediction(request)
+    # Validated on construction: serialize once in pydantic-core, skip response_model re-validation
+    return Response(content=prediction.model_dump_json(), media_type="application/json")
+
+
+async def _build_prediction(request: PredictionRequest) -> PredictionResponse:
+    """Run the predictor and assemble the PredictionResponse (shared by /predict and /predict/batch)"""
+    try:
+        logger.info(f"[PREDICT] Request: {request.service_date} ({request.service_type})")
+        _write_debug_log(f"[PREDICT] Request: {request.service_date} ({request.service_type})")
+        
+        # Get demand predictor
+        predictor = get_demand_predictor()
+        
+        # Generate prediction
+        result = await _predict_bounded(predictor, request)
+        logger.info(f"[PREDICT] Result: {result.get('predicted_covers')} covers")
+        
+        # TODO Hour 3-4: Add reasoning engine + staff recommender
+        # For now, return basic structure
+        
+        # Extract reasoning from predictor result (now includes Claude-generated reasoning)
+        reasoning_data = result.get("reasoning", {})
+        patterns_from_result = reasoning_data.get("patterns_used", [])
+        
+        reasoning = Reasoning(
+            summary=reasoning_data.get("summary", f"{int(result['confidence']*100)}% confidence"),
+            patterns_used=patterns_from_result[:3] if patterns_from_result else [],
+            confidence_factors=reasoning_data.get("confidence_factors", ["Historical patterns"])
+        )
+        
+        # Create StaffRecommendation object from dynamic calculation
+        staff_data = result.get("staff_recommendation", {})
+        # Whole nested shape validated in a single pydantic-core call
+        staff_recommendation = StaffRecommendation.model_validate({
+            role: {**default, **staff_data.get(role, {})}
+            for role, default in _DEFAULT_STAFF_DELTAS.items()
+        } | {
+            "rationale": staff_data.get("rationale", ""),
+            "covers_per_staff": staff_data.get("covers_per_staff", 0.0),
+        })
+        restaurant_context = None
+
+        # Enrich with restaurant profile when available (IVA-52)
+        try:
+            from backend.api.routes import get_supabase
+            supabase = get_supabase()
+            profile_resp = (
+                supabase.table("restaurant_profiles")
+                .select("*")
+                .eq("outlet_name", request.restaurant_id)
+                .limit(1)
+                .execute()
+            )
+            if profile_resp.data and len(profile_resp.data) > 0:
+                profile = profile_resp.data[0]
+                predicted = result["predicted_covers"]
+                turns_dinner = profile.get("turns_dinner", 2.0)
+                total_seats = profile["total_seats"]
+                capacity_pct = round(
+                    (predicted / (total_seats * turns_dinner)) * 100, 1
+                )
+                restaurant_context = {
+                    "total_seats": total_seats,
+                    "breakeven_covers": profile.get("breakeven_covers"),
+                    "target_covers": profile.get("target_covers"),
+                    "capacity_pct": capacity_pct,
+                }
+                # Override staff recommendation with profile-based calculation
+                servers_rec = max(
+                    math.ceil(predicted / profile["covers_per_server"]),
+                    profile.get("min_foh_staff", 2),
+                )
+                hosts_rec = max(
+                    math.ceil(predicted / profile["covers_per_host"]),
+                    1,
+                )
+                kitchen_rec = max(
+                    math.ceil(predicted / profile["covers_per_kitchen"]),
+                    profile.get("min_boh_staff", 2),
+                )
+                # Computed ints from the stored profile: no need to re-validate the deltas
+                staff_recommendation = StaffRecommendation(
+                    servers=StaffDelta.model_construct(
+                        recommended=servers_rec,
+                        usual=servers_rec,
+                        delta=0,
+                    ),
+                    hosts=StaffDelta.model_construct(
+                        recommended=hosts_rec,
+                        usual=hosts_rec,
+                        delta=0,
+                    ),
+                    kitchen=StaffDelta.model_construct(
+                        recommended=kitchen_rec,
+                        usual=kitchen_rec,
+                        delta=0,
+                    ),
+                    rationale=staff_data.get("rationale", ""),
+                    covers_per_staff=round(
+                        predicted / (servers_rec + hosts_rec + kitchen_rec), 1
+                    )
+                    if (servers_rec + hosts_rec + kitchen_rec) > 0
+                    else 0.0,
+                )
+        except Exception as e:
+            logger.debug(f"[PREDICT] No restaurant profile for {request.restaurant_id}: {e}")
+
+        # Extract accuracy_metrics from result
+        accuracy_data = result.get("accuracy_metrics", {})
+        accuracy_metrics = None
+        if accuracy_data:
+            # Convert tuple to list for prediction_interval if present (on a copy:
+            # the result dict is shared through the predict cache)
+            raw_interval = accuracy_data.get("prediction_interval")
+            if isinstance(raw_interval, tuple):
+                accuracy_data = {**accuracy_data, "prediction_interval": list(raw_interval)}
+            accuracy_metrics = AccuracyMetrics(**accuracy_data)
+
+        # Extraire range_low et range_high
+        interval = accuracy_metrics.prediction_interval if accuracy_metrics else None
+        range_low = interval[0] if interval and len(interval) >= 2 else result["predicted_covers"] - 10
+        range_high = interval[1] if interval and len(interval) >= 2 else result["predicted_covers"] + 10
+
+        # Extraire patterns pour stockage (convertis en dict si besoin)
+        patterns_for_storage = []
+        if reasoning_data and "patterns_used" in reasoning_data:
+            raw = reasoning_data["patterns_used"]
+            for p in raw:
+                if isinstance(p, dict):
+                    patterns_for_storage.append(p)
+                elif hasattr(p, "model_dump"):
+                    patterns_for_storage.append(p.model_dump())
+                else:
+                    patterns_for_storage.append(dict(p) if hasattr(p, "__iter__") else {})
+
+        # Extraire confidence_factors
+        confidence_factors = reasoning_data.get("confidence_factors", []) if reasoning_data else []
+
+        # Stocker en Supabase pour feedback loop
+        stored_id = None
+        try:
+            stored_id = await store_prediction_for_feedback(
+                restaurant_id=request.restaurant_id,
+                service_date=request.service_date,
+                service_type=request.service_type,
+                predicted_covers=result["predicted_covers"],
+                confidence=result["confidence"],
+                range_low=range_low,
+                range_high=range_high,
+                estimated_mape=accuracy_metrics.estimated_mape if accuracy_metrics else None,
+                patterns=patterns_for_storage,
+                confidence_factors=confidence_factors
+            )
+        except Exception as e:
+            logger.warning(f"[PREDICT] Store for feedback failed: {e}")
+
+        # Utiliser l'UUID Supabase si disponible, sinon fallback
+        prediction_id = stored_id if stored_id else f"pred_{uuid.uuid4().hex[:8]}"
+
+        # Return PredictionResponse
+        return PredictionResponse(
+            prediction_id=prediction_id,
+            service_date=request.service_date,
+            service_type=request.service_type,
+            predicted_covers=result["predicted_covers"],
+            confidence=result["confidence"],
+            reasoning=reasoning,
+            staff_recommendation=staff_recommendation,
+            accuracy_metrics=accuracy_metrics,
+            restaurant_context=restaurant_context,
+            created_at=utc_now_iso()
+        )
+        
+    except HTTPException:
+        raise
+    except ValueError as e:
+        error_detail = str(e).encode('utf-8', errors='replace').decode('utf-8', errors='replace')
+        logger.warning(f"[PREDICT] ValueError: {error_detail}")
+        raise HTTPException(status_code=422, detail=error_detail)
+    except Exception as e:
+        error_detail = str(e).encode('utf-8', errors='replace').decode('utf-8', errors='replace')
+        logger.error(f"[PREDICT] Error: {error_detail}")
+        raise HTTPException(status_code=500, detail=error_detail)
+
+
+@router.post("/predict/batch")
+async def create_prediction_batch(request: BatchPredictionRequest):
+    """
+    Generate predictions for multiple dates at once.
+    More efficient than calling /predict multiple times.
+    Max 31 dates per request.
+    """
+    try:
+        logger.info(f"[PREDICT/BATCH] Request: {len(request.dates)} dates for {request.restaurant_id} ({request.service_type})")
+        _write_debug_log(f"[PREDICT/BATCH] Request: {len(request.dates)} dates for {request.restaurant_id} ({request.service_type})")
+        
+        MAX_DATES = 31
+        dates = request.dates[:MAX_DATES]
+        try:
+            service_type = ServiceType(request.service_type.lower()).value
+        except (ValueError, AttributeError):
+            service_type = ServiceType.DINNER.value
+
+        predictions = []
+        for d in dates:
+            try:
+                service_date = date.fromisoformat(d)
+            except ValueError as e:
+                logger.warning(f"[PREDICT/BATCH] Invalid date format: {d} - {e}")
+                continue
+            single = PredictionRequest(
+                restaurant_id=request.restaurant_id,
+                service_date=service_date,
+                service_type=service_type,
+            )
+            try:
+                resp = await _build_prediction(single)
+                # Item = {"date": d, ...PredictionResponse fields} (service_date is ISO)
+                predictions.append(
+                    _BATCH_ITEM_PREFIX % orjson.dumps(d) + resp.model_dump_json().encode()[1:]
+                )
+            except Exception as e:
+                logger.warning(f"[PREDICT/BATCH] Skip date {d}: {e}")
+                _write_debug_log(f"[PREDICT/BATCH] Skip date {d}: {e}")
+                # Placeholder keeps one item per date; "error" tells clients not to cache it
+                predictions.append(orjson.dumps({
+                    "date": d,
+                    "service_date": d,
+                    "error": True,
+                    "predicted_covers": 0,
+                    "confidence": 0.0,
+                    "accuracy_metrics": {"prediction_interval": [0, 0]},
+                    "staff_recommendation": {},
+                }))
+        
+        logger.info(f"[PREDICT/BATCH] Success: {len(predictions)} predictions generated")
+        _write_debug_log(f"[PREDICT/BATCH] Success: {len(predictions)} predictions generated")
+        
+        return Response(
+            content=_BATCH_RESPONSE % (
+                b",".join(predictions),
+                len(predictions),
+                orjson.dumps(request.service_type),
+                orjson.dumps(request.restaurant_id),
+            ),
+            media_type="application/json",
+        )
+    except Exception as e:
+        error_detail = str(e).encode('utf-8', errors='replace').decode('utf-8', errors='replace')
+        logger.error(f"[PREDICT/BATCH] Error: {error_detail}")
+        _write_debug_log(f"[PREDICT/BATCH] Error: {error_detail}")
+        raise HTTPException(status_code=500, detail=f"Batch prediction failed: {error_detail}")
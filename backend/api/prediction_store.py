@@ -4,18 +4,25 @@ Service de stockage des prédictions pour le feedback loop.
 Permet de lier les prédictions aux feedbacks via UUID Supabase.
 """
 
+import asyncio
 import logging
+import weakref
 from datetime import date
+from functools import lru_cache
 from typing import Optional, List
-from uuid import UUID, uuid5, NAMESPACE_DNS
+from uuid import UUID, uuid4, uuid5, NAMESPACE_DNS
 
 logger = logging.getLogger(__name__)
 
+_EMPTY_METADATA: dict = {}  # Partagé, lecture seule
 
+
+@lru_cache(maxsize=256)
 def convert_restaurant_id(restaurant_id: str) -> str:
     """
     Convertit un restaurant_id string en UUID déterministe.
     'hotel_main' → toujours le même UUID.
+    Résultat mis en cache (peu de restaurants distincts).
     """
     try:
         # Si c'est déjà un UUID valide, l'utiliser
@@ -34,15 +41,16 @@ def transform_patterns_for_storage(patterns: List[dict]) -> List[dict]:
     if not patterns:
         return []
 
-    transformed = []
-    for p in patterns[:5]:  # Max 5 patterns
-        transformed.append({
+    return [
+        {
             "date": str(p.get("date", "")),
-            "covers": p.get("actual_covers", p.get("covers", 0)),
+            "covers": p["actual_covers"] if "actual_covers" in p else p.get("covers", 0),
             "similarity": p.get("similarity", 0.0),
-            "day_of_week": (p.get("metadata") or {}).get("day_of_week", p.get("day_of_week", ""))
-        })
-    return transformed
+            "day_of_week": md["day_of_week"] if "day_of_week" in md else p.get("day_of_week", "")
+        }
+        for p in patterns[:5]  # Max 5 patterns
+        for md in (p.get("metadata") or _EMPTY_METADATA,)
+    ]
 
 
 def transform_factors_for_storage(confidence_factors: List[str]) -> List[dict]:
@@ -63,7 +71,114 @@ def transform_factors_for_storage(confidence_factors: List[str]) -> List[dict]:
     ]
 
 
-def store_prediction_for_feedback(
+class _PredictionInsertBatcher:
+    """
+    Regroupe les inserts de prédictions en un seul INSERT Supabase.
+
+    Les lignes sont accumulées dans _pending et envoyées toutes les
+    FLUSH_INTERVAL_S secondes, ou dès que MAX_BATCH_SIZE lignes sont en attente.
+    submit() n'attend pas le flush : l'UUID est attribué avant l'insert.
+    """
+
+    MAX_BATCH_SIZE = 50
+    FLUSH_INTERVAL_S = 0.1
+
+    def __init__(self):
+        self._pending: List[dict] = []
+        self._batch_full = asyncio.Event()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._supabase = None
+
+    async def connect(self) -> None:
+        """Client async Supabase, créé une fois par boucle (lève si non configuré)"""
+        if self._supabase is None:
+            from backend.api.routes import get_async_supabase, close_async_supabase
+            client = await get_async_supabase()
+            if self._supabase is None:
+                self._supabase = client
+            else:  # Créé entre-temps par un appel concurrent
+                await close_async_supabase(client)
+
+    def submit(self, row: dict) -> None:
+        self._pending.append(row)
+        if len(self._pending) >= self.MAX_BATCH_SIZE:
+            self._batch_full.set()
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def close(self) -> None:
+        """Envoie les lignes en attente puis ferme le pool HTTP du client"""
+        if self._flush_task is not None and not self._flush_task.done():
+            self._batch_full.set()  # Pas d'attente du prochain intervalle
+            await self._flush_task
+        if self._supabase is not None:
+            from backend.api.routes import close_async_supabase
+            await close_async_supabase(self._supabase)
+            self._supabase = None
+
+    async def _flush_loop(self) -> None:
+        while self._pending:
+            try:
+                await asyncio.wait_for(self._batch_full.wait(), self.FLUSH_INTERVAL_S)
+            except asyncio.TimeoutError:
+                pass
+            batch = self._pending[:self.MAX_BATCH_SIZE]
+            self._pending = self._pending[self.MAX_BATCH_SIZE:]
+            if len(self._pending) < self.MAX_BATCH_SIZE:
+                self._batch_full.clear()
+            await self._insert(batch)
+
+    async def _insert(self, rows: List[dict]) -> None:
+        try:
+            data = await self._post_rows(rows)
+            if len(data) == len(rows):
+                logger.info(f"[PREDICTION_STORE] Stored {len(rows)} prediction(s)")
+            else:
+                logger.warning("[PREDICTION_STORE] Insert returned no data")
+        except Exception as e:
+            logger.warning(f"[PREDICTION_STORE] Failed to store predictions: {e}")
+            if len(rows) > 1:
+                # Une ligne invalide fait échouer tout le lot : on réessaie ligne par ligne
+                for row in rows:
+                    await self._insert_one(row)
+
+    async def _insert_one(self, row: dict) -> None:
+        try:
+            await self._post_rows([row])
+        except Exception as e:
+            logger.warning(f"[PREDICTION_STORE] Failed to store prediction {row['id']}: {e}")
+
+    async def _post_rows(self, rows: List[dict]) -> List[dict]:
+        """INSERT via l'API publique supabase-py (un seul aller-retour PostgREST)"""
+        response = await self._supabase.table("predictions").insert(rows).execute()
+        return response.data or []
+
+
+# Un batcher par boucle d'événements (Event, tâche de flush et client sont liés à leur boucle)
+_batchers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _PredictionInsertBatcher]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_batcher() -> _PredictionInsertBatcher:
+    loop = asyncio.get_running_loop()
+    batcher = _batchers.get(loop)
+    if batcher is None:
+        batcher = _batchers[loop] = _PredictionInsertBatcher()
+    return batcher
+
+
+async def close_prediction_store() -> None:
+    """
+    Vide le batcher de la boucle courante et ferme son client Supabase.
+    Appelé à l'arrêt de l'application (lifespan).
+    """
+    batcher = _batchers.pop(asyncio.get_running_loop(), None)
+    if batcher is not None:
+        await batcher.close()
+
+
+async def store_prediction_for_feedback(
     restaurant_id: str,
     service_date: date,
     service_type: str,
@@ -78,42 +193,35 @@ def store_prediction_for_feedback(
     """
     Enregistre une prédiction dans Supabase pour le feedback loop.
 
+    L'UUID est généré ici et renvoyé tout de suite : l'insert part en
+    arrière-plan, regroupé avec les prédictions concurrentes
+    (voir _PredictionInsertBatcher).
+
     Returns:
-        UUID string si succès, None si échec ou Supabase non configuré.
+        UUID string, None si Supabase non configuré.
     """
+    batcher = _get_batcher()
     try:
-        from backend.api.routes import get_supabase
-        supabase = get_supabase()
+        await batcher.connect()
     except Exception as e:
         logger.warning(f"[PREDICTION_STORE] Supabase not available: {e}")
         return None
 
-    try:
-        # Préparer les données
-        prediction_data = {
-            "restaurant_id": convert_restaurant_id(restaurant_id),
-            "service_date": str(service_date),
-            "service_type": service_type,
-            "predicted_covers": predicted_covers,
-            "confidence": confidence,
-            "range_low": range_low,
-            "range_high": range_high,
-            "estimated_mape": estimated_mape,
-            "factors": transform_factors_for_storage(confidence_factors or []),
-            "similar_patterns": transform_patterns_for_storage(patterns or [])
-        }
-
-        # Insérer en base
-        result = supabase.table("predictions").insert(prediction_data).execute()
-
-        if result.data and len(result.data) > 0:
-            prediction_id = result.data[0].get("id")
-            logger.info(f"[PREDICTION_STORE] Stored prediction {prediction_id}")
-            return str(prediction_id)
-        else:
-            logger.warning("[PREDICTION_STORE] Insert returned no data")
-            return None
-
-    except Exception as e:
-        logger.warning(f"[PREDICTION_STORE] Failed to store prediction: {e}")
-        return None
+    # Préparer les données
+    prediction_data = {
+        "id": str(uuid4()),
+        "restaurant_id": convert_restaurant_id(restaurant_id),
+        "service_date": service_date.isoformat(),
+        "service_type": service_type,
+        "predicted_covers": predicted_covers,
+        "confidence": confidence,
+        "range_low": range_low,
+        "range_high": range_high,
+        "estimated_mape": estimated_mape,
+        "factors": transform_factors_for_storage(confidence_factors or []),
+        "similar_patterns": transform_patterns_for_storage(patterns or [])
+    }
+
+    # Insérer en base (par lot, sans attendre le flush)
+    batcher.submit(prediction_data)
+    return prediction_data["id"]
@@ -1,12 +1,16 @@
 # -*- coding: utf-8 -*-
 """Restaurant Profile API Routes - IVA-52"""
 
-import math
+from operator import itemgetter
+from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, Depends
+import asyncpg
+import orjson
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
 from supabase import Client
 
+from backend.api.db import get_pg_pool, fetch_rows, rows_response
 from backend.api.routes import get_supabase
 from backend.models.restaurant_profile import (
     RestaurantProfileCreate,
@@ -18,45 +22,102 @@ from backend.models.restaurant_profile import (
 
 router = APIRouter(prefix="/api/restaurant", tags=["restaurant"])
 
+# INDUSTRY_DEFAULTS is static: serialize each entry once instead of per request
+_INDUSTRY_DEFAULTS_JSON = {k: orjson.dumps(v) for k, v in INDUSTRY_DEFAULTS.items()}
+_VALID_TYPES = frozenset(INDUSTRY_DEFAULTS)
+_VALID_TYPES_STR = ", ".join(sorted(INDUSTRY_DEFAULTS))
+
+# Profile columns used by the staff recommendation, read in one C-level call.
+# Rows come from SELECT *, so every column is present (DB defaults apply).
+_STAFFING_FIELDS = itemgetter(
+    "covers_per_server",
+    "covers_per_host",
+    "covers_per_runner",
+    "covers_per_kitchen",
+    "min_foh_staff",
+    "min_boh_staff",
+    "turns_dinner",
+    "breakeven_covers",
+    "total_seats",
+)
+
+
+async def _fetch_profile(
+    profile_id: UUID, supabase: Client, pg: Optional[asyncpg.Pool]
+) -> list[dict]:
+    """Fetch a profile by id (asyncpg pool when available, else supabase-py)"""
+    if pg is not None:
+        return await fetch_rows(pg, "SELECT * FROM restaurant_profiles WHERE id = $1", profile_id)
+    return (
+        supabase.table("restaurant_profiles")
+        .select("*")
+        .eq("id", profile_id)
+        .execute()
+    ).data
+
 
 @router.get("/profiles", response_model=list[RestaurantProfileResponse])
-async def list_profiles(supabase: Client = Depends(get_supabase)):
-    """List all restaurant profiles"""
-    response = supabase.table("restaurant_profiles").select("*").execute()
-    return response.data
+async def list_profiles(
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    supabase: Client = Depends(get_supabase),
+    pg: Optional[asyncpg.Pool] = Depends(get_pg_pool),
+):
+    """List restaurant profiles (paginated, oldest first)"""
+    if pg is not None:
+        data = await fetch_rows(
+            pg,
+            "SELECT * FROM restaurant_profiles ORDER BY created_at, id LIMIT $1 OFFSET $2",
+            limit,
+            offset,
+        )
+    else:
+        data = (
+            supabase.table("restaurant_profiles")
+            .select("*")
+            .order("created_at")
+            .order("id")
+            .range(offset, offset + limit - 1)
+            .execute()
+        ).data
+    return rows_response(data)
 
 
 @router.get("/profile/by-name/{outlet_name}", response_model=RestaurantProfileResponse)
 async def get_profile_by_name(
-    outlet_name: str, supabase: Client = Depends(get_supabase)
+    outlet_name: str,
+    supabase: Client = Depends(get_supabase),
+    pg: Optional[asyncpg.Pool] = Depends(get_pg_pool),
 ):
     """Get profile by outlet name (for backward compatibility)"""
-    response = (
-        supabase.table("restaurant_profiles")
-        .select("*")
-        .eq("outlet_name", outlet_name)
-        .limit(1)
-        .execute()
-    )
-    if not response.data:
+    if pg is not None:
+        data = await fetch_rows(
+            pg, "SELECT * FROM restaurant_profiles WHERE outlet_name = $1 LIMIT 1", outlet_name
+        )
+    else:
+        data = (
+            supabase.table("restaurant_profiles")
+            .select("*")
+            .eq("outlet_name", outlet_name)
+            .limit(1)
+            .execute()
+        ).data
+    if not data:
         raise HTTPException(status_code=404, detail="Profile not found")
-    return response.data[0]
+    return rows_response(data[0])
 
 
 @router.get("/profile/{profile_id}", response_model=RestaurantProfileResponse)
 async def get_profile(
-    profile_id: UUID, supabase: Client = Depends(get_supabase)
+    profile_id: UUID,
+    supabase: Client = Depends(get_supabase),
+    pg: Optional[asyncpg.Pool] = Depends(get_pg_pool),
 ):
     """Get a specific restaurant profile"""
-    response = (
-        supabase.table("restaurant_profiles")
-        .select("*")
-        .eq("id", str(profile_id))
-        .execute()
-    )
-    if not response.data:
+    data = await _fetch_profile(profile_id, supabase, pg)
+    if not data:
         raise HTTPException(status_code=404, detail="Profile not found")
-    return response.data[0]
+    return rows_response(data[0])
 
 
 @router.post("/profile", response_model=RestaurantProfileResponse, status_code=201)
@@ -67,7 +128,7 @@ async def create_profile(
     """Create a new restaurant profile"""
     response = (
         supabase.table("restaurant_profiles")
-        .insert(profile.model_dump())
+        .insert(profile.model_dump(mode="json"))
         .execute()
     )
     if not response.data:
@@ -82,7 +143,8 @@ async def update_profile(
     supabase: Client = Depends(get_supabase),
 ):
     """Update an existing restaurant profile"""
-    update_data = {k: v for k, v in profile.model_dump().items() if v is not None}
+    # Only fields the client actually sent (and not null), dumped in one pass
+    update_data = profile.model_dump(exclude_unset=True, exclude_none=True, mode="json")
 
     if not update_data:
         raise HTTPException(status_code=400, detail="No fields to update")
@@ -90,7 +152,7 @@ async def update_profile(
     response = (
         supabase.table("restaurant_profiles")
         .update(update_data)
-        .eq("id", str(profile_id))
+        .eq("id", profile_id)
         .execute()
     )
 
@@ -107,7 +169,7 @@ async def delete_profile(
     response = (
         supabase.table("restaurant_profiles")
         .delete()
-        .eq("id", str(profile_id))
+        .eq("id", profile_id)
         .execute()
     )
     if not response.data:
@@ -118,12 +180,12 @@ async def delete_profile(
 @router.get("/defaults/{restaurant_type}")
 async def get_industry_defaults(restaurant_type: str):
     """Get industry default values for a restaurant type"""
-    if restaurant_type not in INDUSTRY_DEFAULTS:
+    if restaurant_type not in _VALID_TYPES:
         raise HTTPException(
             status_code=400,
-            detail=f"Unknown type. Valid options: {list(INDUSTRY_DEFAULTS.keys())}",
+            detail=f"Unknown type. Valid options: {_VALID_TYPES_STR}",
         )
-    return INDUSTRY_DEFAULTS[restaurant_type]
+    return Response(content=_INDUSTRY_DEFAULTS_JSON[restaurant_type], media_type="application/json")
 
 
 @router.get("/profile/{profile_id}/staff-recommendation", response_model=StaffRecommendation)
@@ -131,41 +193,31 @@ async def get_staff_recommendation(
     profile_id: UUID,
     predicted_covers: int,
     supabase: Client = Depends(get_supabase),
+    pg: Optional[asyncpg.Pool] = Depends(get_pg_pool),
 ):
     """
     Calculate staff recommendation based on profile ratios and predicted covers.
     """
-    response = (
-        supabase.table("restaurant_profiles")
-        .select("*")
-        .eq("id", str(profile_id))
-        .execute()
-    )
-    if not response.data:
+    data = await _fetch_profile(profile_id, supabase, pg)
+    if not data:
         raise HTTPException(status_code=404, detail="Profile not found")
 
-    profile = response.data[0]
-
-    # Calculate raw staff needs
-    raw_servers = predicted_covers / profile["covers_per_server"]
-    raw_hosts = predicted_covers / profile["covers_per_host"]
-    raw_runners = predicted_covers / profile["covers_per_runner"]
-    raw_kitchen = predicted_covers / profile["covers_per_kitchen"]
+    (
+        per_server, per_host, per_runner, per_kitchen,
+        min_foh, min_boh, turns_dinner, breakeven, total_seats,
+    ) = _STAFFING_FIELDS(data[0])
 
-    # Round up and apply minimums
-    servers = max(math.ceil(raw_servers), profile.get("min_foh_staff", 2))
-    hosts = max(math.ceil(raw_hosts), 1)
-    runners = max(math.ceil(raw_runners), 0)
-    kitchen = max(math.ceil(raw_kitchen), profile.get("min_boh_staff", 2))
+    # Integer ceil-div (no float round-trip), then apply minimums
+    servers = max(-(-predicted_covers // per_server), min_foh)
+    hosts = max(-(-predicted_covers // per_host), 1)
+    runners = max(-(-predicted_covers // per_runner), 0)
+    kitchen = max(-(-predicted_covers // per_kitchen), min_boh)
 
     total_foh = servers + hosts + runners
     total_boh = kitchen
 
     # Generate human-readable message
-    turns_dinner = profile.get("turns_dinner", 2.0)
-    capacity_pct = (
-        predicted_covers / (profile["total_seats"] * turns_dinner)
-    ) * 100
+    capacity_pct = (predicted_covers / (total_seats * turns_dinner)) * 100
 
     if capacity_pct < 50:
         intensity = "light"
@@ -174,7 +226,6 @@ async def get_staff_recommendation(
     else:
         intensity = "busy"
 
-    breakeven = profile.get("breakeven_covers")
     if breakeven and predicted_covers < breakeven:
         message = f"Below breakeven ({breakeven} covers). Consider {servers} servers minimum to control costs."
     elif intensity == "busy":
@@ -182,7 +233,7 @@ async def get_staff_recommendation(
     else:
         message = f"{intensity.capitalize()} service ({int(capacity_pct)}% capacity). Standard staffing."
 
-    return StaffRecommendation(
+    recommendation = StaffRecommendation(
         servers=servers,
         hosts=hosts,
         runners=runners,
@@ -191,3 +242,5 @@ async def get_staff_recommendation(
         total_boh=total_boh,
         message=message,
     )
+    # Already validated on construction: serialize once, skip response_model re-validation
+    return Response(content=recommendation.model_dump_json(), media_type="application/json")
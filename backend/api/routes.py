@@ -4,24 +4,45 @@ F&B Agent API Routes
 Week 1: Restaurant Profile + Predictions Storage
 """
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Response
 from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import date, datetime
 from uuid import UUID
+from functools import lru_cache
+import logging
 import os
-from supabase import create_client, Client
+import asyncpg
+import httpx
+import orjson
+from supabase import (
+    create_client,
+    acreate_client,
+    Client,
+    AsyncClient,
+    ClientOptions,
+    AsyncClientOptions,
+)
+
+from backend.api.db import get_pg_pool, fetch_rows, rows_response
+# convert_restaurant_id is lru_cached; prediction_store only imports this module lazily
+from backend.api.prediction_store import convert_restaurant_id
+
+logger = logging.getLogger(__name__)
 
 # ============================================
 # SUPABASE CLIENT
 # ============================================
 
-def get_supabase() -> Client:
-    url = os.environ.get("SUPABASE_URL")
-    key = os.environ.get("SUPABASE_KEY")
-    if not url or not key:
-        raise HTTPException(500, "Supabase not configured")
-    
+# Connection pool sizing for the shared Supabase (PostgREST) HTTP client
+SUPABASE_POOL_MAX = int(os.environ.get("SUPABASE_POOL_MAX", "20"))
+SUPABASE_POOL_KEEPALIVE = int(os.environ.get("SUPABASE_POOL_KEEPALIVE", "10"))
+SUPABASE_KEEPALIVE_EXPIRY_S = 30.0
+SUPABASE_TIMEOUT_S = 5.0
+
+@lru_cache(maxsize=1)
+def _supabase_ssl_verify() -> bool:
+    # Resolved on first client use, not at import (the global SSL patch is a side effect)
     # Workaround for SSL certificate issues on Windows (local dev only)
     # Set SUPABASE_SSL_VERIFY=false in .env to disable SSL verification
     ssl_verify = os.environ.get("SUPABASE_SSL_VERIFY", "true").lower() not in ("false", "0", "no")
@@ -31,7 +52,63 @@ def get_supabase() -> Client:
         # Disable SSL verification globally (local dev only!)
         ssl._create_default_https_context = ssl._create_unverified_context
     
-    return create_client(url, key)
+    return ssl_verify
+
+# Resolved once at import (main.py loads .env before importing the routers)
+SUPABASE_URL = os.environ.get("SUPABASE_URL")
+SUPABASE_KEY = os.environ.get("SUPABASE_KEY")
+
+if not SUPABASE_URL or not SUPABASE_KEY:
+    # Supabase is optional: only the DB-backed routes fail (500) without it
+    logger.warning("[SUPABASE] SUPABASE_URL/SUPABASE_KEY not set - database routes disabled")
+
+def _supabase_credentials() -> tuple[str, str]:
+    if not SUPABASE_URL or not SUPABASE_KEY:
+        raise HTTPException(500, "Supabase not configured")
+    return SUPABASE_URL, SUPABASE_KEY
+
+def _pool_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=SUPABASE_POOL_MAX,
+        max_keepalive_connections=SUPABASE_POOL_KEEPALIVE,
+        keepalive_expiry=SUPABASE_KEEPALIVE_EXPIRY_S,
+    )
+
+@lru_cache(maxsize=1)
+def _shared_supabase_client() -> Client:
+    # One shared client: reuses its HTTP connection pool across requests
+    url, key = _supabase_credentials()
+    options = ClientOptions(
+        postgrest_client_timeout=SUPABASE_TIMEOUT_S,
+        storage_client_timeout=int(SUPABASE_TIMEOUT_S),
+        httpx_client=httpx.Client(
+            limits=_pool_limits(),
+            timeout=SUPABASE_TIMEOUT_S,
+            verify=_supabase_ssl_verify(),
+        ),
+    )
+    return create_client(url, key, options=options)
+
+def get_supabase() -> Client:
+    return _shared_supabase_client()
+
+async def get_async_supabase() -> AsyncClient:
+    """Async Supabase client (non-blocking PostgREST calls)"""
+    url, key = _supabase_credentials()
+    options = AsyncClientOptions(
+        postgrest_client_timeout=SUPABASE_TIMEOUT_S,
+        storage_client_timeout=int(SUPABASE_TIMEOUT_S),
+        httpx_client=httpx.AsyncClient(
+            limits=_pool_limits(),
+            timeout=SUPABASE_TIMEOUT_S,
+            verify=_supabase_ssl_verify(),
+        ),
+    )
+    return await acreate_client(url, key, options=options)
+
+async def close_async_supabase(client: AsyncClient) -> None:
+    """Close the HTTP connection pool owned by an async client from get_async_supabase()"""
+    await client.options.httpx_client.aclose()
 
 # ============================================
 # SCHEMAS
@@ -144,49 +221,53 @@ async def create_restaurant_profile(
     if existing.data:
         # Update existing
         result = supabase.table("restaurant_profile")\
-            .update(profile.model_dump())\
+            .update(profile.model_dump(mode="json"))\
             .eq("id", existing.data[0]["id"])\
             .execute()
     else:
         # Create new
         result = supabase.table("restaurant_profile")\
-            .insert(profile.model_dump())\
+            .insert(profile.model_dump(mode="json"))\
             .execute()
     
     return result.data[0]
 
+# Industry standard defaults (static: serialized once at import)
+RESTAURANT_DEFAULTS = {
+    "casual_dining": {
+        "covers_per_server": 20,
+        "covers_per_host": 60,
+        "covers_per_busser": 40,
+        "covers_per_kitchen": 30,
+        "turns_lunch": 1.5,
+        "turns_dinner": 1.2,
+        "labor_cost_target": 0.30
+    },
+    "fine_dining": {
+        "covers_per_server": 12,
+        "covers_per_host": 40,
+        "covers_per_busser": 25,
+        "covers_per_kitchen": 20,
+        "turns_lunch": 1.0,
+        "turns_dinner": 1.0,
+        "labor_cost_target": 0.35
+    },
+    "fast_casual": {
+        "covers_per_server": 35,
+        "covers_per_host": 100,
+        "covers_per_busser": 60,
+        "covers_per_kitchen": 40,
+        "turns_lunch": 2.5,
+        "turns_dinner": 2.0,
+        "labor_cost_target": 0.25
+    }
+}
+_RESTAURANT_DEFAULTS_JSON = orjson.dumps(RESTAURANT_DEFAULTS)
+
 @router.get("/restaurant/defaults")
 async def get_industry_defaults():
     """Return industry standard defaults for restaurant configuration"""
-    return {
-        "casual_dining": {
-            "covers_per_server": 20,
-            "covers_per_host": 60,
-            "covers_per_busser": 40,
-            "covers_per_kitchen": 30,
-            "turns_lunch": 1.5,
-            "turns_dinner": 1.2,
-            "labor_cost_target": 0.30
-        },
-        "fine_dining": {
-            "covers_per_server": 12,
-            "covers_per_host": 40,
-            "covers_per_busser": 25,
-            "covers_per_kitchen": 20,
-            "turns_lunch": 1.0,
-            "turns_dinner": 1.0,
-            "labor_cost_target": 0.35
-        },
-        "fast_casual": {
-            "covers_per_server": 35,
-            "covers_per_host": 100,
-            "covers_per_busser": 60,
-            "covers_per_kitchen": 40,
-            "turns_lunch": 2.5,
-            "turns_dinner": 2.0,
-            "labor_cost_target": 0.25
-        }
-    }
+    return Response(content=_RESTAURANT_DEFAULTS_JSON, media_type="application/json")
 
 # --- Predictions ---
 
@@ -196,11 +277,8 @@ async def store_prediction(
     supabase: Client = Depends(get_supabase)
 ):
     """Store a prediction for feedback tracking"""
-    data = prediction.model_dump()
-    data["service_date"] = str(data["service_date"])
-    data["restaurant_id"] = str(data["restaurant_id"])
-    data["factors"] = [f.model_dump() if hasattr(f, 'model_dump') else f for f in data["factors"]]
-    data["similar_patterns"] = [p.model_dump() if hasattr(p, 'model_dump') else p for p in data["similar_patterns"]]
+    # mode="json": nested models, dates and UUIDs serialized in one pass
+    data = prediction.model_dump(mode="json")
     
     result = supabase.table("predictions").insert(data).execute()
     return result.data[0]
@@ -208,16 +286,20 @@ async def store_prediction(
 @router.get("/predictions/{prediction_id}", response_model=PredictionResponse)
 async def get_prediction(
     prediction_id: UUID,
-    supabase: Client = Depends(get_supabase)
+    supabase: Client = Depends(get_supabase),
+    pg: Optional[asyncpg.Pool] = Depends(get_pg_pool)
 ):
     """Get a specific prediction"""
-    result = supabase.table("predictions")\
-        .select("*")\
-        .eq("id", str(prediction_id))\
-        .execute()
-    if not result.data:
+    if pg is not None:
+        data = await fetch_rows(pg, "SELECT * FROM predictions WHERE id = $1", prediction_id)
+    else:
+        data = supabase.table("predictions")\
+            .select("*")\
+            .eq("id", prediction_id)\
+            .execute().data
+    if not data:
         raise HTTPException(404, "Prediction not found")
-    return result.data[0]
+    return rows_response(data[0])
 
 # --- Feedback ---
 
@@ -227,11 +309,6 @@ async def submit_feedback(
     supabase: Client = Depends(get_supabase)
 ):
     """Submit pre-service or post-service feedback"""
-    import logging
-    from backend.api.prediction_store import convert_restaurant_id
-
-    logger = logging.getLogger(__name__)
-
     # prediction_id must be a valid UUID (stored in Supabase). "pred_xxx" means storage failed.
     if feedback.prediction_id.startswith("pred_"):
         raise HTTPException(
@@ -240,8 +317,7 @@ async def submit_feedback(
             "Ensure predictions and user_feedback tables exist. Re-run the prediction to try again."
         )
 
-    data = feedback.model_dump()
-    data["prediction_id"] = feedback.prediction_id
+    data = feedback.model_dump(mode="json")
     data["restaurant_id"] = convert_restaurant_id(feedback.restaurant_id)
 
     try:
@@ -262,33 +338,50 @@ async def submit_feedback(
 @router.get("/feedback/prediction/{prediction_id}")
 async def get_prediction_feedback(
     prediction_id: UUID,
-    supabase: Client = Depends(get_supabase)
+    supabase: Client = Depends(get_supabase),
+    pg: Optional[asyncpg.Pool] = Depends(get_pg_pool)
 ):
     """Get all feedback for a prediction"""
-    result = supabase.table("user_feedback")\
-        .select("*")\
-        .eq("prediction_id", str(prediction_id))\
-        .order("created_at", desc=True)\
-        .execute()
-    return result.data
+    if pg is not None:
+        data = await fetch_rows(
+            pg,
+            "SELECT * FROM user_feedback WHERE prediction_id = $1 ORDER BY created_at DESC",
+            prediction_id,
+        )
+    else:
+        data = supabase.table("user_feedback")\
+            .select("*")\
+            .eq("prediction_id", prediction_id)\
+            .order("created_at", desc=True)\
+            .execute().data
+    return rows_response(data)
 
 # --- Accuracy (Week 3, but endpoint ready) ---
 
+# Same aggregate as the accuracy_summary() SQL function (supabase/migrations)
+ACCURACY_SUMMARY_SQL = (
+    "SELECT count(*) AS feedbacks_count, "
+    "avg(accuracy_pct)::float8 AS avg_accuracy, "
+    "(avg(within_range::int) * 100)::float8 AS within_range_pct "
+    "FROM user_feedback "
+    "WHERE accuracy_pct IS NOT NULL AND created_at > NOW() - make_interval(days => $1)"
+)
+
 @router.get("/accuracy/summary")
 async def get_accuracy_summary(
     days: int = 7,
-    supabase: Client = Depends(get_supabase)
+    supabase: Client = Depends(get_supabase),
+    pg: Optional[asyncpg.Pool] = Depends(get_pg_pool)
 ):
     """Get accuracy summary for last N days"""
-    # Get feedbacks with accuracy
-    result = supabase.table("user_feedback")\
-        .select("accuracy_pct, within_range, created_at")\
-        .not_.is_("accuracy_pct", "null")\
-        .order("created_at", desc=True)\
-        .limit(100)\
-        .execute()
+    # Aggregated in the database: one row back instead of the raw feedbacks
+    if pg is not None:
+        rows = await fetch_rows(pg, ACCURACY_SUMMARY_SQL, days)
+    else:
+        rows = supabase.rpc("accuracy_summary", {"days": days}).execute().data
+    summary = rows[0] if rows else {}
     
-    if not result.data:
+    if not summary.get("feedbacks_count"):
         return {
             "period_days": days,
             "feedbacks_count": 0,
@@ -297,13 +390,9 @@ async def get_accuracy_summary(
             "message": "No feedback data yet. Submit actual covers to start tracking."
         }
     
-    feedbacks = result.data
-    accuracies = [f["accuracy_pct"] for f in feedbacks if f["accuracy_pct"]]
-    within_range = [f["within_range"] for f in feedbacks if f["within_range"] is not None]
-    
     return {
         "period_days": days,
-        "feedbacks_count": len(feedbacks),
-        "avg_accuracy": sum(accuracies) / len(accuracies) if accuracies else None,
-        "within_range_pct": (sum(within_range) / len(within_range) * 100) if within_range else None
+        "feedbacks_count": summary["feedbacks_count"],
+        "avg_accuracy": summary["avg_accuracy"],
+        "within_range_pct": summary["within_range_pct"]
     }
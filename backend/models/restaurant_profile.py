@@ -89,6 +89,8 @@ class StaffRecommendation(BaseModel):
     total_boh: int
     message: str  # Human-readable recommendation
 
+    model_config = ConfigDict(frozen=True)
+
 
 # Industry defaults for "Not sure? Use defaults" button
 INDUSTRY_DEFAULTS = {
@@ -4,8 +4,10 @@ Data schemas for F&B Operations Agent
 Pydantic models for request/response validation
 """
 
+import time
+
 from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional, List
+from typing import Annotated, Literal, Optional, List
 from datetime import date
 from enum import Enum
 
@@ -17,6 +19,22 @@ class ServiceType(str, Enum):
     BRUNCH = "brunch"
 
 
+# Request/response annotation: pydantic-core validates a Literal with a plain
+# string lookup instead of building an Enum member. Use ServiceType(value)
+# where the enum is actually needed.
+ServiceTypeValue = Literal["lunch", "dinner", "brunch"]
+
+
+# Score in [0, 1]. The bounds stay declarative so pydantic-core checks them
+# natively (a Python AfterValidator would add a callback per value)
+UnitInterval = Annotated[float, Field(ge=0.0, le=1.0)]
+
+
+def utc_now_iso() -> str:
+    """Current UTC time as ISO 8601 string (second precision, e.g. 2024-12-02T18:00:00Z)"""
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+
 class PredictionRequest(BaseModel):
     """Request model for prediction endpoint"""
     model_config = ConfigDict(
@@ -31,7 +49,7 @@ class PredictionRequest(BaseModel):
     
     restaurant_id: str = Field(..., description="Restaurant identifier")
     service_date: date = Field(..., description="Date of service (YYYY-MM-DD)")
-    service_type: ServiceType = Field(..., description="Type of service")
+    service_type: ServiceTypeValue = Field(..., description="Type of service")
 
 
 class BatchPredictionRequest(BaseModel):
@@ -47,7 +65,7 @@ class Pattern(BaseModel):
     date: date
     event_type: Optional[str] = None
     actual_covers: int
-    similarity: float = Field(..., ge=0.0, le=1.0, description="Similarity score 0-1")
+    similarity: UnitInterval = Field(..., description="Similarity score 0-1")
     metadata: dict = Field(default_factory=dict)
 
 
@@ -113,9 +131,9 @@ class PredictionResponse(BaseModel):
     
     prediction_id: str
     service_date: date
-    service_type: ServiceType
+    service_type: ServiceTypeValue
     predicted_covers: int
-    confidence: float = Field(..., ge=0.0, le=1.0)
+    confidence: UnitInterval
     reasoning: Reasoning
     staff_recommendation: StaffRecommendation
     accuracy_metrics: Optional[AccuracyMetrics] = None
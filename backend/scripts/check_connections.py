@@ -0,0 +1,59 @@
+"""
+Check the Claude and Qdrant connections concurrently
+Run locally instead of exposing the probes (paid API calls) on the public API
+
+Usage: python backend/scripts/check_connections.py [--only claude|qdrant]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+from typing import Optional
+from dotenv import load_dotenv
+
+# Load environment from project root
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+load_dotenv(dotenv_path=PROJECT_ROOT / ".env")
+sys.path.insert(0, str(PROJECT_ROOT))
+
+
+async def check_claude() -> dict:
+    """Test Claude API connection"""
+    from backend.utils.claude_client import ClaudeClient
+    async with ClaudeClient() as client:
+        return await client.test_connection()
+
+
+async def check_qdrant() -> dict:
+    """Test Qdrant connection"""
+    from backend.utils.qdrant_client import QdrantManager
+    return await QdrantManager().test_connection()
+
+
+CHECKS = {"claude": check_claude, "qdrant": check_qdrant}
+
+
+async def _probe(check) -> dict:
+    try:
+        return await check()
+    except Exception as e:  # e.g. ANTHROPIC_API_KEY missing
+        return {"status": "error", "message": str(e)}
+
+
+async def check_connections(only: Optional[str] = None) -> dict:
+    """Run the probes concurrently; with only, the other SDK is never imported"""
+    checks = {only: CHECKS[only]} if only else CHECKS
+    results = await asyncio.gather(*(_probe(check) for check in checks.values()))
+    return dict(zip(checks, results))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check Claude and Qdrant connections")
+    parser.add_argument("--only", choices=sorted(CHECKS), help="Run a single probe")
+    args = parser.parse_args()
+
+    results = asyncio.run(check_connections(args.only))
+    print(json.dumps(results, indent=2, default=str))
+    sys.exit(0 if all(r.get("status") == "success" for r in results.values()) else 1)
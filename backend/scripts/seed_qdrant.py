@@ -9,7 +9,15 @@ from pathlib import Path
 from dotenv import load_dotenv
 from mistralai import Mistral
 from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams, PointStruct
+from qdrant_client.models import (
+    Distance,
+    VectorParams,
+    PointStruct,
+    HnswConfigDiff,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+)
 
 # Load environment from project root
 env_path = Path(__file__).parent.parent.parent / ".env"
@@ -21,6 +29,10 @@ COLLECTION_NAME = "fb_patterns"
 EMBEDDING_MODEL = "mistral-embed"
 EMBEDDING_DIM = 1024
 BATCH_SIZE = 50  # Mistral batch limit
+HNSW_M = 32  # Graph degree per node
+HNSW_EF_CONSTRUCT = 100  # Build-time beam width
+# int8 scalar quantization (SQ8): ~4x less vector memory, FP32 kept on disk for rescoring
+ENABLE_SQ8 = os.getenv("ENABLE_SQ8", "").lower() in ("true", "1", "yes")
 
 def get_clients():
     """Initialize Mistral and Qdrant clients"""
@@ -49,10 +61,26 @@ def create_collection(qdrant: QdrantClient):
         print(f"Deleting existing collection '{COLLECTION_NAME}'...")
         qdrant.delete_collection(COLLECTION_NAME)
     
-    print(f"Creating collection '{COLLECTION_NAME}'...")
+    quantization_config = None
+    if ENABLE_SQ8:
+        quantization_config = ScalarQuantization(
+            scalar=ScalarQuantizationConfig(
+                type=ScalarType.INT8,
+                quantile=0.99,
+                always_ram=True
+            )
+        )
+    
+    print(f"Creating collection '{COLLECTION_NAME}' (SQ8: {ENABLE_SQ8})...")
     qdrant.create_collection(
         collection_name=COLLECTION_NAME,
-        vectors_config=VectorParams(size=EMBEDDING_DIM, distance=Distance.COSINE)
+        vectors_config=VectorParams(
+            size=EMBEDDING_DIM,
+            distance=Distance.COSINE,
+            on_disk=ENABLE_SQ8  # Original FP32 vectors only needed for rescoring
+        ),
+        hnsw_config=HnswConfigDiff(m=HNSW_M, ef_construct=HNSW_EF_CONSTRUCT),
+        quantization_config=quantization_config
     )
 
 def pattern_to_context(pattern: dict) -> str:
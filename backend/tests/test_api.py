@@ -10,10 +10,16 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from fastapi.testclient import TestClient
 from main import app
 
-client = TestClient(app)
 
 
-def test_root_endpoint():
+@pytest.fixture(scope="session")
+def client():
+    """One TestClient for the whole session: lifespan runs once, connections are reused"""
+    with TestClient(app) as c:
+        yield c
+
+
+def test_root_endpoint(client):
     """Test root endpoint returns correct response"""
     response = client.get("/")
     assert response.status_code == 200
@@ -23,7 +29,7 @@ def test_root_endpoint():
     assert data["status"] == "Phase 1 - Backend Development"
 
 
-def test_health_endpoint():
+def test_health_endpoint(client):
     """Test health endpoint"""
     response = client.get("/health")
     assert response.status_code == 200
@@ -31,7 +37,7 @@ def test_health_endpoint():
     assert data["status"] == "healthy"
 
 
-def test_qdrant_test_endpoint():
+def test_qdrant_test_endpoint(client):
     """Test Qdrant connection endpoint"""
     response = client.get("/test/qdrant")
     assert response.status_code == 200
@@ -41,12 +47,229 @@ def test_qdrant_test_endpoint():
     assert data["status"] in ["success", "error"]
 
 
+@pytest.mark.asyncio
+async def test_predict_batched_qdrant(monkeypatch):
+    """Concurrent predictions search patterns with one query_batch_points call, never N single searches"""
+    import asyncio
+    from datetime import date
+    from unittest.mock import AsyncMock, MagicMock
+    from backend.agents.demand_predictor import get_demand_predictor
+    from backend.models.schemas import PredictionRequest
+
+    def hit(service_type):
+        return MagicMock(id=1, score=0.9, payload={
+            "date": "2024-12-14", "actual_covers": 120, "service_type": service_type,
+        })
+
+    qdrant = MagicMock()
+    qdrant.query_batch_points.side_effect = lambda collection_name, requests: [
+        MagicMock(points=[hit(r.filter.must[0].match.value)]) for r in requests
+    ]
+    agent = get_demand_predictor()
+    monkeypatch.setattr(agent, "qdrant_client", qdrant)
+    monkeypatch.setattr(agent, "mistral_client", MagicMock())
+    monkeypatch.setattr(agent, "_get_embedding", AsyncMock(return_value=[0.1] * 4))
+
+    async def find_patterns(service_type):
+        request = PredictionRequest(
+            restaurant_id="resto_123", service_date=date(2024, 12, 15), service_type=service_type
+        )
+        return await agent._find_similar_patterns(request, await agent._fetch_external_context(request))
+
+    (dinner, dinner_degraded), (lunch, lunch_degraded) = await asyncio.gather(
+        find_patterns("dinner"), find_patterns("lunch")
+    )
+
+    assert [p.actual_covers for p in dinner] == [120]
+    assert [p.actual_covers for p in lunch] == [120]
+    assert not dinner_degraded and not lunch_degraded
+    assert qdrant.query_batch_points.call_count == 1
+    assert len(qdrant.query_batch_points.call_args.kwargs["requests"]) == 2
+    qdrant.search.assert_not_called()
+    qdrant.query_points.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_pattern_searches_share_one_batch(monkeypatch):
+    """Concurrent _search_qdrant calls are coalesced into a single Qdrant round-trip"""
+    import asyncio
+    from unittest.mock import MagicMock
+    from backend.agents.demand_predictor import get_demand_predictor
+
+    qdrant = MagicMock()
+    qdrant.query_batch_points.side_effect = lambda collection_name, requests: [
+        MagicMock(points=[f"hit_{r.filter.must[0].match.value}"]) for r in requests
+    ]
+    agent = get_demand_predictor()
+    monkeypatch.setattr(agent, "qdrant_client", qdrant)
+
+    results = await asyncio.gather(
+        agent._search_qdrant([0.1] * 4, "dinner"),
+        agent._search_qdrant([0.2] * 4, "lunch"),
+        agent._search_qdrant([0.3] * 4, "breakfast"),
+    )
+
+    assert results == [["hit_dinner"], ["hit_lunch"], ["hit_breakfast"]]
+    assert qdrant.query_batch_points.call_count == 1
+
+
+def test_pattern_batcher_survives_a_closed_loop():
+    """A loop closed mid-window doesn't strand later submits made on a new loop"""
+    import asyncio
+    from backend.utils.pattern_batcher import PatternBatcher
+
+    async def search_batch(queries, limit):
+        return [[service_type] for _, service_type in queries]
+
+    batcher = PatternBatcher(search_batch, window_ms=50)
+    old_loop = asyncio.new_event_loop()
+    old_loop.create_task(batcher.submit([0.1] * 4, "dinner"))
+    old_loop.run_until_complete(asyncio.sleep(0))  # Arms the window timer
+    old_loop.close()
+
+    async def submit_on_new_loop():
+        return await asyncio.wait_for(batcher.submit([0.2] * 4, "lunch"), timeout=1)
+
+    assert asyncio.run(submit_on_new_loop()) == ["lunch"]
+
+
+@pytest.mark.asyncio
+async def test_predict_cache_skips_degraded_results():
+    """Fallback results are returned but not cached; normal results are"""
+    from backend.agents._predict_cache import PredictCache
+
+    cache = PredictCache()
+    calls = []
+
+    async def compute(degraded):
+        calls.append(degraded)
+        return {"predicted_covers": 80, "degraded": degraded}
+
+    await cache.get_or_compute(b"k1", 60, lambda: compute(True))
+    await cache.get_or_compute(b"k1", 60, lambda: compute(False))
+    await cache.get_or_compute(b"k1", 60, lambda: compute(False))
+
+    assert calls == [True, False]
+
+
+class _StubSupabase:
+    """Async supabase-py stand-in: records each insert, optionally failing some rows"""
+
+    def __init__(self, fail_when=lambda rows: False):
+        self.inserts = []
+        self._fail_when = fail_when
+
+    def table(self, name):
+        assert name == "predictions"
+        return self
+
+    def insert(self, rows):
+        self._rows = rows
+        return self
+
+    async def execute(self):
+        from unittest.mock import MagicMock
+        rows = self._rows
+        self.inserts.append(rows)
+        if self._fail_when(rows):
+            raise RuntimeError("insert rejected")
+        return MagicMock(data=list(rows))
+
+
+async def _store_concurrently(covers_list):
+    import asyncio
+    from datetime import date
+    from backend.api.prediction_store import store_prediction_for_feedback
+
+    return await asyncio.gather(*(
+        store_prediction_for_feedback(
+            restaurant_id="hotel_main",
+            service_date=date(2025, 1, 15),
+            service_type="dinner",
+            predicted_covers=covers,
+            confidence=0.8,
+            range_low=covers - 10,
+            range_high=covers + 10,
+        )
+        for covers in covers_list
+    ))
+
+
+@pytest.mark.asyncio
+async def test_concurrent_stores_share_one_insert():
+    """Concurrent store_prediction_for_feedback calls return at once and are flushed as one INSERT"""
+    from backend.api.prediction_store import _get_batcher
+
+    supabase = _StubSupabase()
+    batcher = _get_batcher()
+    batcher._supabase = supabase
+
+    ids = await _store_concurrently([100, 101, 102, 103])
+    assert supabase.inserts == []  # Ids are handed out before the flush
+    await batcher._flush_task
+
+    assert len(supabase.inserts) == 1
+    assert [row["id"] for row in supabase.inserts[0]] == ids
+    assert [row["predicted_covers"] for row in supabase.inserts[0]] == [100, 101, 102, 103]
+    assert supabase.inserts[0][0]["service_date"] == "2025-01-15"
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_retries_rows_individually():
+    """A rejected batch is retried row by row, so one bad row doesn't drop the others"""
+    from backend.api.prediction_store import _get_batcher
+
+    supabase = _StubSupabase(fail_when=lambda rows: any(r["predicted_covers"] == 101 for r in rows))
+    batcher = _get_batcher()
+    batcher._supabase = supabase
+
+    ids = await _store_concurrently([100, 101, 102])
+    await batcher._flush_task
+
+    assert [len(rows) for rows in supabase.inserts] == [3, 1, 1, 1]
+    assert [rows[0]["id"] for rows in supabase.inserts[1:]] == ids
+
+
 @pytest.mark.skipif(
     True, reason="Requires ANTHROPIC_API_KEY in .env"
 )
-def test_claude_test_endpoint():
+def test_claude_test_endpoint(client):
     """Test Claude API connection endpoint (requires API key)"""
     response = client.get("/test/claude")
     assert response.status_code == 200
     data = response.json()
     assert "status" in data
+
+
+def test_store_prediction_serializes_payload(client):
+    """Stored prediction payload is JSON-ready (ISO dates, string UUIDs)"""
+    from unittest.mock import MagicMock
+    from backend.api.routes import get_supabase
+
+    supabase = MagicMock()
+    table = supabase.table.return_value
+    table.insert.return_value.execute.side_effect = lambda: MagicMock(
+        data=[{**table.insert.call_args.args[0],
+               "id": "00000000-0000-0000-0000-000000000001",
+               "created_at": "2025-01-15T10:00:00+00:00"}]
+    )
+    app.dependency_overrides[get_supabase] = lambda: supabase
+    try:
+        response = client.post("/api/predictions", json={
+            "restaurant_id": "00000000-0000-0000-0000-000000000002",
+            "service_date": "2025-01-15",
+            "service_type": "dinner",
+            "predicted_covers": 120,
+            "confidence": 0.85,
+            "range_low": 100,
+            "range_high": 140,
+            "factors": [{"name": "weather", "value": 1.0, "impact_pct": 5.0}],
+        })
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    data = table.insert.call_args.args[0]
+    assert data["service_date"] == "2025-01-15"
+    assert data["restaurant_id"] == "00000000-0000-0000-0000-000000000002"
+    assert data["factors"][0]["name"] == "weather"
@@ -0,0 +1,31 @@
+"""
+Async API smoke tests (endpoints probed concurrently)
+"""
+
+import asyncio
+import pytest
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+from main import app
+
+
+@pytest.mark.asyncio
+async def test_basic_endpoints_concurrently():
+    """Root, health and Qdrant test endpoints respond when dispatched together"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        root, health, qdrant = await asyncio.gather(
+            client.get("/"),
+            client.get("/health"),
+            client.get("/test/qdrant"),
+        )
+
+    assert root.status_code == 200
+    assert root.json()["status"] == "running"
+    assert health.status_code == 200
+    assert health.json()["status"] == "healthy"
+    assert qdrant.status_code == 200
+    assert qdrant.json()["status"] in ["success", "error"]
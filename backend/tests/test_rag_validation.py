@@ -273,7 +273,13 @@ def run_validation():
         print(f"  All scenarios use Qdrant: {all_qdrant}")
         print(f"  Directional consistency: {result1['predicted_covers'] >= result3['predicted_covers']}")
     
-    asyncio.run(run_all())
+    # libuv event loop for the live Qdrant/Mistral/Claude calls when available
+    try:
+        import uvloop
+        run = uvloop.run
+    except ImportError:  # Windows, or uvloop not installed
+        run = asyncio.run
+    run(run_all())
     
     print("\n" + "=" * 60)
     print("VALIDATION COMPLETE")
@@ -3,6 +3,7 @@
 UTF-8 Encoding Configuration
 Must be imported FIRST before any other modules to ensure all outputs use UTF-8
 """
+import codecs
 import sys
 import io
 import os
@@ -10,32 +11,36 @@ import os
 # Set environment variable for Python's default encoding FIRST
 os.environ['PYTHONIOENCODING'] = 'utf-8'
 
-# Force UTF-8 encoding for all outputs BEFORE any other imports
-if hasattr(sys.stdout, 'buffer'):
+
+def _is_utf8(stream) -> bool:
+    """True if the stream already writes UTF-8 (or was wrapped by this module)"""
+    if getattr(stream, '_utf8_wrapped', False):
+        return True
+    encoding = getattr(stream, 'encoding', None)
     try:
-        # Check current encoding
-        current_encoding = getattr(sys.stdout, 'encoding', None)
-        if current_encoding != 'utf-8':
-            # Replace with UTF-8 wrapper
-            sys.stdout = io.TextIOWrapper(
-                sys.stdout.buffer, 
-                encoding='utf-8', 
-                errors='replace',
-                line_buffering=True
-            )
-    except (AttributeError, ValueError):
-        pass
+        return encoding is not None and codecs.lookup(encoding).name == 'utf-8'
+    except LookupError:
+        return False
 
-if hasattr(sys.stderr, 'buffer'):
+
+def _utf8_stream(stream):
+    """Wrap stream in a UTF-8 TextIOWrapper, unless it already is UTF-8"""
+    if _is_utf8(stream) or not hasattr(stream, 'buffer'):
+        return stream
     try:
-        current_encoding = getattr(sys.stderr, 'encoding', None)
-        if current_encoding != 'utf-8':
-            sys.stderr = io.TextIOWrapper(
-                sys.stderr.buffer, 
-                encoding='utf-8', 
-                errors='replace',
-                line_buffering=True
-            )
+        wrapped = io.TextIOWrapper(
+            stream.buffer, 
+            encoding='utf-8', 
+            errors='replace',
+            line_buffering=True
+        )
+        wrapped._utf8_wrapped = True
+        return wrapped
     except (AttributeError, ValueError):
-        pass
+        return stream
+
 
+# Force UTF-8 encoding for all outputs BEFORE any other imports
+# (no-op when stdio is already UTF-8, e.g. PEP 540 UTF-8 mode, or already wrapped)
+sys.stdout = _utf8_stream(sys.stdout)
+sys.stderr = _utf8_stream(sys.stderr)
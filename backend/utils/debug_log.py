@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+"""
+Debug Log
+Optional file logging shared by the API entry point and agents
+"""
+
+import os
+from datetime import datetime
+from pathlib import Path
+
+
+def get_debug_log_path() -> str | None:
+    """Get debug log path from environment or use relative path.
+    Returns None if file logging is disabled (for Docker/production)."""
+    if os.getenv("DISABLE_FILE_LOGGING", "").lower() in ("true", "1", "yes"):
+        return None
+    return os.getenv("DEBUG_LOG_PATH", str(Path(__file__).parent.parent.parent / "debug.log"))
+
+
+def write_debug_log(message: str) -> None:
+    """Write to debug log file if file logging is enabled."""
+    debug_log_path = get_debug_log_path()
+    if debug_log_path is None:
+        return
+    try:
+        with open(debug_log_path, "a", encoding="utf-8") as f:
+            f.write(f"{message} - {datetime.now()}\n")
+            f.flush()
+    except Exception:
+        pass  # Silently ignore file logging errors in production
@@ -0,0 +1,104 @@
+"""
+Pattern Batcher
+Coalesces concurrent Qdrant pattern searches into one query_batch_points call
+"""
+
+import asyncio
+import os
+import weakref
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+# How long the first query of a batch waits for others to join
+BATCH_WINDOW_MS = float(os.getenv("PATTERN_BATCH_WINDOW_MS", "5"))
+# Queries per Qdrant round-trip (a full batch is dispatched without waiting)
+MAX_BATCH = int(os.getenv("PATTERN_MAX_BATCH", "32"))
+
+Query = Tuple[List[float], str]  # (embedding, service_type)
+SearchBatch = Callable[[List[Query], int], Awaitable[List[List]]]
+Pending = Tuple[List[float], str, int, asyncio.Future]
+
+
+class _LoopState:
+    """Pending queries and timers of one event loop (futures are loop-bound)"""
+
+    def __init__(self):
+        self.pending: List[Pending] = []
+        self.timer: Optional[asyncio.Task] = None
+        self.inflight: Set[asyncio.Task] = set()  # Keep dispatch tasks referenced
+
+
+class PatternBatcher:
+    """
+    Micro-batcher for pattern searches
+
+    submit() queues the query with its own asyncio.Future. The first query
+    arms a BATCH_WINDOW_MS timer; when it fires (or MAX_BATCH queries are
+    pending) the whole batch goes to search_batch in one call and each
+    caller's future gets its own hits. Concurrent /predict requests thus
+    share one Qdrant round-trip instead of one each.
+    """
+
+    def __init__(
+        self,
+        search_batch: SearchBatch,
+        window_ms: float = BATCH_WINDOW_MS,
+        max_batch: int = MAX_BATCH
+    ):
+        self._search_batch = search_batch
+        self.window_s = window_ms / 1000
+        self.max_batch = max_batch
+        # One state per event loop, so a closed loop never strands later submits
+        self._states: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        state = self._states.get(loop)
+        if state is None:
+            state = self._states[loop] = _LoopState()
+        return state
+
+    async def submit(self, embedding: List[float], service_type: str, limit: int = 5) -> List:
+        """Queue one search and wait for its hits"""
+        state = self._state()
+        future = asyncio.get_running_loop().create_future()
+        state.pending.append((embedding, service_type, limit, future))
+        if len(state.pending) >= self.max_batch:
+            if state.timer is not None:
+                state.timer.cancel()
+                state.timer = None
+            self._dispatch(state)
+        elif state.timer is None:
+            state.timer = asyncio.create_task(self._dispatch_after_window(state))
+        return await future
+
+    async def _dispatch_after_window(self, state: _LoopState) -> None:
+        await asyncio.sleep(self.window_s)
+        state.timer = None
+        self._dispatch(state)
+
+    def _dispatch(self, state: _LoopState) -> None:
+        batch, state.pending = state.pending, []
+        if batch:
+            task = asyncio.create_task(self._run(batch))
+            state.inflight.add(task)
+            task.add_done_callback(state.inflight.discard)
+
+    async def _run(self, batch: List[Pending]) -> None:
+        # One search per distinct limit (normally a single group)
+        groups: Dict[int, List[Pending]] = {}
+        for item in batch:
+            groups.setdefault(item[2], []).append(item)
+
+        for limit, items in groups.items():
+            try:
+                results = await self._search_batch([(e, st) for e, st, _, _ in items], limit)
+            except Exception as e:
+                for *_, future in items:
+                    if not future.done():  # Caller may have been cancelled
+                        future.set_exception(e)
+                continue
+            for (*_, future), hits in zip(items, results):
+                if not future.done():
+                    future.set_result(hits)
@@ -12,6 +12,21 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+
+def qdrant_connection_kwargs() -> dict:
+    """
+    Connection options shared by remote QdrantClient instances
+
+    QDRANT_POOL_SIZE sizes the connection pool (httpx max_connections for REST,
+    channel count for gRPC, whose default is only 3) so concurrent /predict
+    searches don't queue on a handful of connections.
+    QDRANT_PREFER_GRPC=true switches searches to gRPC (port 6334).
+    """
+    return {
+        "pool_size": int(os.getenv("QDRANT_POOL_SIZE", "16")),
+        "prefer_grpc": os.getenv("QDRANT_PREFER_GRPC", "").lower() in ("true", "1", "yes"),
+    }
+
 class QdrantManager:
     def __init__(self):
         self.url = os.getenv("QDRANT_URL")
@@ -20,7 +35,8 @@ class QdrantManager:
         if self.url and self.api_key:
             self.client = QdrantClient(
                 url=self.url,
-                api_key=self.api_key
+                api_key=self.api_key,
+                **qdrant_connection_kwargs()
             )
             self.mode = "cloud"
         else:
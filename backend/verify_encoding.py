@@ -7,54 +7,62 @@ import sys
 import os
 import io
 
+# Unicode sample for the output test (module constant, built once)
+_TEST_CHARS = "Test: é, è, à, ç, ñ, ü, °, →"
+
 def check_encoding():
     """Verify UTF-8 encoding is properly configured"""
-    print("=" * 60)
-    print("UTF-8 Encoding Verification")
-    print("=" * 60)
+    # Collect the report and write it once (stdout is line-buffered)
+    out = []
+    out.append("=" * 60)
+    out.append("UTF-8 Encoding Verification")
+    out.append("=" * 60)
     
     # Check Python default encoding
-    print(f"\n1. Python Default Encoding: {sys.getdefaultencoding()}")
+    out.append(f"\n1. Python Default Encoding: {sys.getdefaultencoding()}")
     if sys.getdefaultencoding() != 'utf-8':
-        print("   ⚠️  WARNING: Default encoding is not UTF-8")
+        out.append("   ⚠️  WARNING: Default encoding is not UTF-8")
     else:
-        print("   ✅ OK")
+        out.append("   ✅ OK")
     
     # Check stdout encoding
-    print(f"\n2. stdout Encoding: {sys.stdout.encoding}")
+    out.append(f"\n2. stdout Encoding: {sys.stdout.encoding}")
     if sys.stdout.encoding != 'utf-8':
-        print("   ⚠️  WARNING: stdout encoding is not UTF-8")
-        print("   ℹ️  utf8_config.py should fix this on import")
+        out.append("   ⚠️  WARNING: stdout encoding is not UTF-8")
+        out.append("   ℹ️  utf8_config.py should fix this on import")
     else:
-        print("   ✅ OK")
+        out.append("   ✅ OK")
     
     # Check stderr encoding
-    print(f"\n3. stderr Encoding: {sys.stderr.encoding}")
+    out.append(f"\n3. stderr Encoding: {sys.stderr.encoding}")
     if sys.stderr.encoding != 'utf-8':
-        print("   ⚠️  WARNING: stderr encoding is not UTF-8")
-        print("   ℹ️  utf8_config.py should fix this on import")
+        out.append("   ⚠️  WARNING: stderr encoding is not UTF-8")
+        out.append("   ℹ️  utf8_config.py should fix this on import")
     else:
-        print("   ✅ OK")
+        out.append("   ✅ OK")
     
     # Check environment variable
-    print(f"\n4. PYTHONIOENCODING: {os.environ.get('PYTHONIOENCODING', 'Not set')}")
+    out.append(f"\n4. PYTHONIOENCODING: {os.environ.get('PYTHONIOENCODING', 'Not set')}")
     if os.environ.get('PYTHONIOENCODING') != 'utf-8':
-        print("   ⚠️  WARNING: PYTHONIOENCODING not set to utf-8")
+        out.append("   ⚠️  WARNING: PYTHONIOENCODING not set to utf-8")
     else:
-        print("   ✅ OK")
+        out.append("   ✅ OK")
     
     # Test UTF-8 output
-    print("\n5. UTF-8 Output Test:")
+    out.append("\n5. UTF-8 Output Test:")
     try:
-        test_chars = "Test: é, è, à, ç, ñ, ü, °, →"
-        print(f"   Output: {test_chars}")
-        print("   ✅ UTF-8 characters displayed correctly")
+        _TEST_CHARS.encode(sys.stdout.encoding or 'ascii')  # Fails here rather than on the final write
+        out.append(f"   Output: {_TEST_CHARS}")
+        out.append("   ✅ UTF-8 characters displayed correctly")
     except Exception as e:
-        print(f"   ❌ ERROR: {e}")
+        out.append(f"   ❌ ERROR: {e}")
+    
+    out.append("\n" + "=" * 60)
+    out.append("Verification Complete")
+    out.append("=" * 60)
     
-    print("\n" + "=" * 60)
-    print("Verification Complete")
-    print("=" * 60)
+    sys.stdout.write("\n".join(out) + "\n")
+    sys.stdout.flush()
 
 if __name__ == '__main__':
     # Import utf8_config first to apply encoding fixes
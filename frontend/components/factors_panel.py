@@ -1,11 +1,31 @@
 """Factors Panel Component — Display reasoning and contextual factors."""
 
 import streamlit as st
+from statistics import fmean
 from typing import Optional, List, Dict
 
 from config import get_text
 
 
+def _pattern_covers(p: dict) -> int:
+    return p.get("actual_covers", p.get("covers", 0))
+
+
+def precompute_pattern_stats(prediction: Optional[dict]) -> None:
+    """
+    Store the similar-patterns average in reasoning["_avg_pattern_covers"].
+
+    Called once when a prediction is fetched, so reruns read a scalar
+    instead of re-walking the patterns.
+    """
+    reasoning = (prediction or {}).get("reasoning")
+    if not isinstance(reasoning, dict):
+        return
+    patterns = reasoning.get("patterns_used") or []
+    if patterns:
+        reasoning["_avg_pattern_covers"] = fmean(map(_pattern_covers, patterns))
+
+
 def _aggregate_reasoning(predictions: List[Dict], lang: str) -> tuple:
     """Collect summaries and confidence_factors from a list of predictions with reasoning."""
     summaries = []
@@ -150,12 +170,9 @@ def render_factors_panel(
         with col2:
             st.markdown(f"**{get_text('factors.baseline', lang)}**")
             if patterns:
-                valid_covers = [p.get("actual_covers", p.get("covers", 0)) for p in patterns]
-                avg = (
-                    sum(valid_covers) / len(valid_covers)
-                    if valid_covers
-                    else 0
-                )
+                avg = reasoning.get("_avg_pattern_covers")
+                if avg is None:
+                    avg = fmean(map(_pattern_covers, patterns))
                 st.markdown(
                     f"- {get_text('factors.avg_similar', lang)}: {int(avg)} covers"
                 )
@@ -3,9 +3,11 @@
 import streamlit as st
 import requests
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional
 
 from config import get_text, API_BASE
+from http_session import SESSION
 
 
 def _restaurant_to_id(restaurant: str) -> str:
@@ -34,6 +36,7 @@ def render_feedback_panel(
     Post-service: "How did it go?" → Actual covers input
 
     Only shown for day view with a valid prediction_id (UUID, not pred_xxx).
+    Both forms are fragments: their widgets rerun only the form, not the page.
     """
     if view != "day":
         return
@@ -79,6 +82,7 @@ def render_feedback_panel(
         )
 
 
+@st.fragment
 def _render_pre_service_feedback(
     prediction_id: str,
     predicted_covers: int,
@@ -131,7 +135,7 @@ def _render_pre_service_feedback(
             use_container_width=True,
         ):
             st.session_state[feedback_key]["status"] = "higher"
-            st.rerun()
+            st.rerun(scope="fragment")
 
     with col3:
         if st.button(
@@ -140,7 +144,7 @@ def _render_pre_service_feedback(
             use_container_width=True,
         ):
             st.session_state[feedback_key]["status"] = "lower"
-            st.rerun()
+            st.rerun(scope="fragment")
 
     if st.session_state[feedback_key].get("status") in ["higher", "lower"]:
         st.markdown("<div style='height: 0.5rem;'></div>", unsafe_allow_html=True)
@@ -177,6 +181,7 @@ def _render_pre_service_feedback(
             )
 
 
+@st.fragment
 def _render_post_service_feedback(
     prediction_id: str,
     predicted_covers: int,
@@ -186,29 +191,17 @@ def _render_post_service_feedback(
     lang: str,
 ) -> None:
     """Post-service: Record actual results."""
-    existing_list = _get_existing_feedback(prediction_id)
-    existing = None
-    if existing_list and len(existing_list) > 0:
-        for fb in existing_list:
+    # Covers submitted in this session: skip the GET round-trip on rerun
+    actual = st.session_state.get(_post_service_key(prediction_id))
+    if actual is None:
+        existing_list = _get_existing_feedback(prediction_id)
+        for fb in existing_list or []:
             if fb.get("actual_covers") is not None:
-                existing = fb
+                actual = fb["actual_covers"]
                 break
 
-    if existing and existing.get("actual_covers") is not None:
-        actual = existing["actual_covers"]
-        diff = actual - predicted_covers
-        accuracy = (
-            max(0, 100 - abs(diff / predicted_covers * 100))
-            if predicted_covers > 0
-            else 0
-        )
-
-        if accuracy >= 90:
-            acc_color = "#40916C"
-        elif accuracy >= 80:
-            acc_color = "#E9C46A"
-        else:
-            acc_color = "#E76F51"
+    if actual is not None:
+        accuracy, acc_color = _accuracy(actual, predicted_covers)
 
         st.markdown(
             f"""
@@ -281,6 +274,29 @@ def _render_post_service_feedback(
             )
 
 
+def _post_service_key(prediction_id: str) -> str:
+    return f"post_service_actual_{prediction_id}"
+
+
+@lru_cache(maxsize=128)
+def _accuracy(actual: int, predicted_covers: int) -> tuple:
+    """Accuracy % of the prediction against actual covers, and its display color."""
+    diff = actual - predicted_covers
+    accuracy = (
+        max(0, 100 - abs(diff / predicted_covers * 100))
+        if predicted_covers > 0
+        else 0
+    )
+
+    if accuracy >= 90:
+        acc_color = "#40916C"
+    elif accuracy >= 80:
+        acc_color = "#E9C46A"
+    else:
+        acc_color = "#E76F51"
+    return accuracy, acc_color
+
+
 def _submit_pre_service_feedback(
     prediction_id: str,
     feedback_type: str,
@@ -302,7 +318,7 @@ def _submit_pre_service_feedback(
             ),
         }
 
-        response = requests.post(
+        response = SESSION.post(
             f"{API_BASE}/api/feedback",
             json=payload,
             timeout=10,
@@ -310,7 +326,7 @@ def _submit_pre_service_feedback(
 
         if response.status_code in [200, 201]:
             st.session_state[state_key]["submitted"] = True
-            st.rerun()
+            st.rerun(scope="fragment")
         else:
             st.error(
                 f"{get_text('feedback.error', lang)}: {response.status_code}"
@@ -335,15 +351,16 @@ def _submit_post_service_feedback(
             "actual_covers": actual_covers,
         }
 
-        response = requests.post(
+        response = SESSION.post(
             f"{API_BASE}/api/feedback",
             json=payload,
             timeout=10,
         )
 
         if response.status_code in [200, 201]:
+            st.session_state[_post_service_key(prediction_id)] = actual_covers
             st.success(get_text("feedback.success_post", lang))
-            st.rerun()
+            st.rerun(scope="fragment")
         else:
             st.error(
                 f"{get_text('feedback.error', lang)}: {response.status_code}"
@@ -356,7 +373,7 @@ def _submit_post_service_feedback(
 def _get_existing_feedback(prediction_id: str) -> Optional[list]:
     """Check if feedback already exists. GET /api/feedback/prediction/{id} returns list."""
     try:
-        response = requests.get(
+        response = SESSION.get(
             f"{API_BASE}/api/feedback/prediction/{prediction_id}",
             timeout=5,
         )
@@ -4,6 +4,16 @@ import streamlit as st
 from datetime import datetime, timedelta, date
 from config import get_text
 
+# Month selectbox labels in calendar order (module constants, not rebuilt per rerun)
+_MONTHS_EN = (
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+)
+_MONTHS_FR = (
+    "Janvier", "Février", "Mars", "Avril", "Mai", "Juin",
+    "Juillet", "Août", "Septembre", "Octobre", "Novembre", "Décembre",
+)
+
 
 def _navigate_period(direction: int, view: str) -> None:
     """Navigate to previous/next period"""
@@ -105,15 +115,7 @@ def render_header(lang: str = "en") -> dict:
                     st.rerun()
             else:
                 # Month view: month + year selectboxes
-                months_en = [
-                    "January", "February", "March", "April", "May", "June",
-                    "July", "August", "September", "October", "November", "December",
-                ]
-                months_fr = [
-                    "Janvier", "Février", "Mars", "Avril", "Mai", "Juin",
-                    "Juillet", "Août", "Septembre", "Octobre", "Novembre", "Décembre",
-                ]
-                months = months_fr if lang == "fr" else months_en
+                months = _MONTHS_FR if lang == "fr" else _MONTHS_EN
                 current_year = date.today().year
                 years = list(range(current_year - 2, current_year + 3))
                 if current.year not in years:
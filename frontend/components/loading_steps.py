@@ -2,7 +2,7 @@
 
 import streamlit as st
 import time
-from typing import List, Dict, Callable, Any, Optional
+from typing import List, Dict, Any, Optional
 
 from config import get_text
 
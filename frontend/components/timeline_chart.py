@@ -1,12 +1,12 @@
 """Timeline Chart Component - Apollo Style"""
 
 import streamlit as st
-import plotly.graph_objects as go
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 import requests
 
 from config import API_BASE, get_text
+from http_session import SESSION
 
 
 def render_day_hero(prediction: dict, date: datetime, lang: str = "en") -> None:
@@ -102,6 +102,10 @@ def _restaurant_to_id(restaurant: str) -> str:
     return restaurant_map.get(restaurant, restaurant.lower().replace(" ", "_"))
 
 
+# Same labels as strftime("%a") in the C locale, without formatting per row
+_DAY_ABBR = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+
+
 def _normalize_prediction(p: dict, dates: list, start_date: datetime, i: int) -> dict:
     """Normalize a single prediction from API response. Returns None if invalid."""
     date_str = p.get("date") or p.get("service_date") or (dates[i] if i < len(dates) else "")
@@ -112,14 +116,16 @@ def _normalize_prediction(p: dict, dates: list, start_date: datetime, i: int) ->
         dt = datetime.fromisoformat(date_str) if date_str else start_date + timedelta(days=i)
     except (ValueError, TypeError):
         dt = start_date + timedelta(days=i)
-    covers = p.get("predicted_covers") if p.get("predicted_covers") is not None else p.get("covers", 0)
-    metrics = p.get("accuracy_metrics") or {}
-    interval = metrics.get("prediction_interval") or [0, 0]
-    range_low = interval[0] if len(interval) >= 1 else 0
-    range_high = interval[1] if len(interval) >= 2 else 0
+    covers = p.get("predicted_covers")
+    if covers is None:
+        covers = p.get("covers", 0)
+    interval = (p.get("accuracy_metrics") or {}).get("prediction_interval") or ()
+    n_bounds = len(interval)
+    range_low = interval[0] if n_bounds >= 1 else 0
+    range_high = interval[1] if n_bounds >= 2 else 0
     return {
         "date": dt,
-        "day": dt.strftime("%a"),
+        "day": _DAY_ABBR[dt.weekday()],
         "covers": int(covers) if covers is not None else 0,
         "range_low": range_low,
         "range_high": range_high,
@@ -127,6 +133,48 @@ def _normalize_prediction(p: dict, dates: list, start_date: datetime, i: int) ->
     }
 
 
+class _PartialBatch(Exception):
+    """Batch response with failed items (e.g. backend busy): used once, never cached."""
+
+    def __init__(self, predictions: list):
+        super().__init__("Some batch predictions failed")
+        self.predictions = predictions
+
+
+@st.cache_data(ttl=900, show_spinner=False)
+def _cached_batch(restaurant_id: str, dates: tuple, service_type: str) -> list:
+    """
+    POST /predict/batch, cached per (restaurant, dates, service) across reruns and sessions.
+
+    Errors raise and are not cached, and so do responses with failed items
+    (_PartialBatch). The 15 min TTL bounds staleness after a backend retrain;
+    the cache is in-memory and resets on app restart.
+    """
+    response = SESSION.post(
+        f"{API_BASE}/predict/batch",
+        json={
+            "dates": list(dates),
+            "service_type": service_type,
+            "restaurant_id": restaurant_id,
+        },
+        timeout=120,
+    )
+    response.raise_for_status()
+    data = response.json()
+    predictions = data if isinstance(data, list) else (data.get("predictions") or [])
+    if any(isinstance(p, dict) and p.get("error") for p in predictions):
+        raise _PartialBatch(predictions)
+    return predictions
+
+
+def _fetch_batch(restaurant_id: str, dates: tuple, service_type: str) -> list:
+    """Batch predictions, from the cache when the last response had no failed items."""
+    try:
+        return _cached_batch(restaurant_id, dates, service_type)
+    except _PartialBatch as e:
+        return e.predictions  # Shown as-is; the next rerun asks the backend again
+
+
 def get_week_predictions(
     start_date: datetime, restaurant: str, service: str
 ) -> List[Dict]:
@@ -138,20 +186,7 @@ def get_week_predictions(
     restaurant_id = _restaurant_to_id(restaurant)
     service_type = service.lower()
     try:
-        response = requests.post(
-            f"{API_BASE}/predict/batch",
-            json={
-                "dates": dates,
-                "service_type": service_type,
-                "restaurant_id": restaurant_id,
-            },
-            timeout=120,
-        )
-        if response.status_code != 200:
-            st.error(f"Week forecast API returned {response.status_code}. Check backend.")
-            return []
-        data = response.json()
-        raw = data if isinstance(data, list) else (data.get("predictions") or [])
+        raw = _fetch_batch(restaurant_id, tuple(dates), service_type)
         predictions = []
         for i, p in enumerate(raw):
             if not isinstance(p, dict):
@@ -166,13 +201,16 @@ def get_week_predictions(
                 dt = start_date + timedelta(days=i)
                 predictions.append({
                     "date": dt,
-                    "day": dt.strftime("%a"),
+                    "day": _DAY_ABBR[dt.weekday()],
                     "covers": 0,
                     "range_low": 0,
                     "range_high": 0,
                     "confidence": 0,
                 })
         return predictions[:7]
+    except requests.exceptions.HTTPError as e:
+        st.error(f"Week forecast API returned {e.response.status_code}. Check backend.")
+        return []
     except requests.exceptions.ConnectionError:
         st.error("Unable to connect to backend API. Please ensure the backend is running.")
         return []
@@ -198,20 +236,7 @@ def get_month_predictions(
     restaurant_id = _restaurant_to_id(restaurant)
     service_type = service.lower()
     try:
-        response = requests.post(
-            f"{API_BASE}/predict/batch",
-            json={
-                "dates": dates,
-                "service_type": service_type,
-                "restaurant_id": restaurant_id,
-            },
-            timeout=120,
-        )
-        if response.status_code != 200:
-            st.error(f"Month forecast API returned {response.status_code}. Check backend.")
-            return None
-        data = response.json()
-        raw = data if isinstance(data, list) else (data.get("predictions") or [])
+        raw = _fetch_batch(restaurant_id, tuple(dates), service_type)
         start_date = datetime(year, month, 1)
         normalized = []
         for i, p in enumerate(raw):
@@ -228,6 +253,9 @@ def get_month_predictions(
                     "reasoning": p.get("reasoning"),
                 })
         return normalized if normalized else None
+    except requests.exceptions.HTTPError as e:
+        st.error(f"Month forecast API returned {e.response.status_code}. Check backend.")
+        return None
     except requests.exceptions.ConnectionError:
         st.error("Unable to connect to backend API. Please ensure the backend is running.")
         return None
@@ -241,34 +269,24 @@ def get_month_predictions(
         return None
 
 
-def render_week_chart(
-    predictions: List[Dict],
-    selected_date: Optional[datetime] = None,
-    baseline: Optional[float] = None,
-    lang: str = "en",
-) -> None:
-    """Render Apollo-style weekly bar chart."""
-    if not predictions:
-        st.info(get_text("week.no_data", lang))
-        return
-
-    days = [p["day"] for p in predictions]
-    covers = [p["covers"] for p in predictions]
+# Figures are cached as resources (shared, not copied): st.plotly_chart only
+# serializes them, and a cache_data pickle round-trip would re-run Plotly's validation
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _week_figure(
+    days: tuple, covers: tuple, highlighted: tuple, baseline: Optional[float], title: str
+):
+    """Weekly bar chart figure, built once per distinct week/selection/baseline/title."""
+    import plotly.graph_objects as go  # Lazy: day view never loads Plotly
 
-    colors = []
-    for p in predictions:
-        if selected_date and p["date"].date() == selected_date.date():
-            colors.append("#1B4332")
-        else:
-            colors.append("#2D6A4F")
+    colors = ["#1B4332" if selected else "#2D6A4F" for selected in highlighted]
 
     fig = go.Figure()
     fig.add_trace(
         go.Bar(
-            x=days,
-            y=covers,
+            x=list(days),
+            y=list(covers),
             marker_color=colors,
-            text=covers,
+            text=list(covers),
             textposition="outside",
             textfont=dict(size=14, color="#212529"),
             hovertemplate="<b>%{x}</b><br>%{y} covers<extra></extra>",
@@ -285,7 +303,7 @@ def render_week_chart(
         )
 
     fig.update_layout(
-        title=get_text("chart.week_forecast", lang),
+        title=title,
         xaxis=dict(
             title=None,
             tickfont=dict(size=14, color="#495057"),
@@ -304,87 +322,82 @@ def render_week_chart(
         showlegend=False,
         bargap=0.3,
     )
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
 
-def render_day_chart(prediction: Dict) -> None:
-    """Render single day view with range indicator."""
-    covers = prediction.get("covers", 0)
-    range_low = prediction.get("range_low", 0)
-    range_high = prediction.get("range_high", 0)
+def render_week_chart(
+    predictions: List[Dict],
+    selected_date: Optional[datetime] = None,
+    baseline: Optional[float] = None,
+    lang: str = "en",
+) -> None:
+    """Render Apollo-style weekly bar chart."""
+    if not predictions:
+        st.info(get_text("week.no_data", lang))
+        return
 
-    fig = go.Figure()
-    fig.add_trace(
-        go.Bar(
-            x=["Forecast"],
-            y=[range_high - range_low],
-            base=range_low,
-            marker_color="#D8F3DC",
-            name="Range",
-            hoverinfo="skip",
-            width=0.6,
-        )
+    selected_day = selected_date.date() if selected_date else None
+    fig = _week_figure(
+        tuple(p["day"] for p in predictions),
+        tuple(p["covers"] for p in predictions),
+        tuple(p["date"].date() == selected_day for p in predictions),
+        baseline,
+        get_text("chart.week_forecast", lang),
     )
-    fig.add_trace(
-        go.Bar(
-            x=["Forecast"],
-            y=[covers],
-            marker_color="#2D6A4F",
-            name="Predicted",
-            text=[f"{covers}"],
-            textposition="outside",
-            textfont=dict(size=24, color="#212529"),
-            width=0.4,
+    st.plotly_chart(fig, use_container_width=True)
+
+
+@st.cache_data(show_spinner=False)
+def _day_range_html(covers: int, range_low: int, range_high: int) -> str:
+    """Range band + predicted marker as static HTML (cached per integer triple)."""
+    scale = max(range_high, covers, 1) * 1.15
+    low_pct = range_low / scale * 100
+    width_pct = max(range_high - range_low, 0) / scale * 100
+    covers_pct = covers / scale * 100
+    return f"""<div style="padding: 1rem 0;">
+        <div style="font-size: 24px; font-weight: 600; color: #212529; text-align: center;">{covers}</div>
+        <div style="position: relative; height: 24px; background: #F8F9FA; border-radius: 6px; margin: 8px 0;">
+            <div style="position: absolute; left: {low_pct:.1f}%; width: {width_pct:.1f}%; height: 100%;
+                background: #D8F3DC; border-radius: 6px;"></div>
+            <div style="position: absolute; left: {covers_pct:.1f}%; width: 4px; height: 100%;
+                background: #2D6A4F; transform: translateX(-2px);"></div>
+        </div>
+        <p style="color: #6C757D; font-size: 12px; text-align: center; margin: 0;">
+            Range: {range_low} – {range_high}
+        </p>
+    </div>"""
+
+
+def render_day_chart(prediction: Dict) -> None:
+    """Render single day view with range indicator (HTML band, no Plotly figure)."""
+    st.html(
+        _day_range_html(
+            int(prediction.get("covers", 0)),
+            int(prediction.get("range_low", 0)),
+            int(prediction.get("range_high", 0)),
         )
     )
-    fig.update_layout(
-        title=None,
-        xaxis=dict(visible=False),
-        yaxis=dict(
-            title="Covers",
-            tickfont=dict(size=12, color="#6C757D"),
-            gridcolor="#E9ECEF",
-            zeroline=False,
-        ),
-        plot_bgcolor="white",
-        paper_bgcolor="white",
-        margin=dict(l=60, r=40, t=20, b=20),
-        height=250,
-        showlegend=False,
-        barmode="overlay",
-    )
-    fig.add_annotation(
-        x="Forecast",
-        y=range_high,
-        text=f"Range: {range_low} – {range_high}",
-        showarrow=False,
-        yshift=30,
-        font=dict(size=12, color="#6C757D"),
-    )
-    st.plotly_chart(fig, use_container_width=True)
 
 
-def render_month_chart_from_data(month_predictions: List[Dict], lang: str = "en") -> None:
-    """Render monthly bar chart from pre-fetched predictions."""
-    if not month_predictions:
-        return
-    days = [p.get("date", "")[-2:] for p in month_predictions]
-    covers = [p.get("predicted_covers", 0) for p in month_predictions]
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _month_figure(days: tuple, covers: tuple, title: str):
+    """Monthly bar chart figure, built once per distinct month/title."""
+    import plotly.graph_objects as go  # Lazy: day view never loads Plotly
     colors = ["#2D6A4F"] * len(covers)
     fig = go.Figure()
     fig.add_trace(
         go.Bar(
-            x=days,
-            y=covers,
+            x=list(days),
+            y=list(covers),
             marker_color=colors,
-            text=covers,
+            text=list(covers),
             textposition="outside",
             textfont=dict(size=10, color="#212529"),
             hovertemplate="<b>Day %{x}</b><br>%{y} covers<extra></extra>",
         )
     )
     fig.update_layout(
-        title=get_text("chart.month_forecast", lang),
+        title=title,
         xaxis=dict(title="Day", tickfont=dict(size=11, color="#495057"), showgrid=False),
         yaxis=dict(title=None, tickfont=dict(size=11, color="#6C757D"), gridcolor="#E9ECEF", zeroline=False),
         plot_bgcolor="white",
@@ -394,6 +407,19 @@ def render_month_chart_from_data(month_predictions: List[Dict], lang: str = "en"
         showlegend=False,
         bargap=0.3,
     )
+    return fig
+
+
+def render_month_chart_from_data(month_predictions: List[Dict], lang: str = "en") -> None:
+    """Render monthly bar chart from pre-fetched predictions."""
+    if not month_predictions:
+        return
+
+    fig = _month_figure(
+        tuple(p.get("date", "")[-2:] for p in month_predictions),
+        tuple(p.get("predicted_covers", 0) for p in month_predictions),
+        get_text("chart.month_forecast", lang),
+    )
     st.plotly_chart(fig, use_container_width=True)
 
 
@@ -1,7 +1,10 @@
 """Aetherix Design System Configuration"""
 
+import json
 import os
+from functools import lru_cache
 from pathlib import Path
+from typing import Optional
 
 # API
 API_BASE = os.environ.get("AETHERIX_API_BASE", "http://localhost:8000")
@@ -210,18 +213,68 @@ setTimeout(function() {
 </script>
 """
 
+# Meta tags pour forcer le rechargement et éviter le cache JavaScript
+_NO_CACHE_META = """
+<meta http-equiv="Cache-Control" content="no-cache, no-store, must-revalidate">
+<meta http-equiv="Pragma" content="no-cache">
+<meta http-equiv="Expires" content="0">
+"""
+
+# Everything app.py injects into the page head, concatenated once per process
+PAGE_HEAD_HTML = _NO_CACHE_META + AETHERIX_CSS
 
+
+@lru_cache(maxsize=None)
+def _load_locale(lang: str) -> Optional[dict]:
+    """Parse locales/<lang>.json once per process (None if the locale is missing)"""
+    locale_file = Path(__file__).parent / "locales" / f"{lang}.json"
+    if not locale_file.exists():
+        return None
+    with open(locale_file, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+@lru_cache(maxsize=512)
 def get_text(key: str, lang: str = "en") -> str:
     """Get translated text by key"""
-    import json
+    translations = _load_locale(lang)
+    if translations is None:
+        return key
+    keys = key.split(".")
+    value = translations
+    for k in keys:
+        value = value.get(k, key)
+    return value if isinstance(value, str) else key
 
-    locale_file = Path(__file__).parent / "locales" / f"{lang}.json"
-    if locale_file.exists():
-        with open(locale_file, "r", encoding="utf-8") as f:
-            translations = json.load(f)
-            keys = key.split(".")
-            value = translations
-            for k in keys:
-                value = value.get(k, key)
-            return value if isinstance(value, str) else key
-    return key
+
+@lru_cache(maxsize=None)
+def show_menu_button_html(lang: str) -> str:
+    """Floating button that re-opens the collapsed sidebar (HTML built once per language)"""
+    label = get_text("sidebar.show_menu", lang)
+    return f"""
+<div style="
+    position: fixed;
+    top: 1rem;
+    left: 1rem;
+    z-index: 9999;
+">
+    <button type="button" onclick="
+        (function() {{
+            var el = document.querySelector('[data-testid=\"collapsedControl\"]') 
+                || document.querySelector('[aria-label*=\"sidebar\"]')
+                || document.querySelector('[aria-label*=\"Sidebar\"]');
+            if (el) el.click();
+        }})();
+    " style="
+        background-color: #166534;
+        color: white;
+        border: none;
+        border-radius: 6px;
+        padding: 0.5rem 0.75rem;
+        font-size: 0.875rem;
+        font-weight: 500;
+        cursor: pointer;
+        box-shadow: 0 1px 3px rgba(0,0,0,0.15);
+    ">{label}</button>
+</div>
+"""
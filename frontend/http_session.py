@@ -0,0 +1,19 @@
+"""Shared HTTP session for backend API calls (keep-alive connection pool)."""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Retries on gateway errors apply to idempotent methods only (urllib3 default),
+# so POST /predict and /api/feedback are never sent twice
+_RETRY = Retry(
+    total=2,
+    backoff_factor=0.3,
+    status_forcelist=[502, 503, 504],
+    raise_on_status=False,  # Return the last response; callers check status_code
+)
+
+SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=_RETRY)
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
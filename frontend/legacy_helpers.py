@@ -4,10 +4,13 @@ API_URL, EXPLAINER_CONTENT, BASELINE_STATS, and helper functions.
 """
 
 import os
-from datetime import date, timedelta
+from bisect import bisect_right
+from collections import namedtuple
 from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from functools import lru_cache
 
-import requests
+from http_session import SESSION
 
 # Configuration (use API_URL env for local dev, e.g. http://localhost:8000)
 API_URL = os.getenv("API_URL", "https://ivandemurard-fb-agent-api.hf.space")
@@ -74,26 +77,30 @@ BASELINE_STATS = {
 }
 
 
+# MAPE thresholds (%) and the score for each band: < 15, < 25, < 40, >= 40
+_RELIABILITY_THRESHOLDS = (15, 25, 40)
+_RELIABILITY_SCORES = (
+    ("green", "", "Excellent", "High reliability. Plan staffing normally."),
+    ("yellow", "", "Acceptable", "Good reliability. Consider a ±10% staffing buffer."),
+    (
+        "orange",
+        "",
+        "Monitor",
+        "Moderate variance. Plan for flexibility — have backup staff available.",
+    ),
+    ("red", "", "Low reliability", "High variance expected. Consider a wider staffing range."),
+)
+_RELIABILITY_UNKNOWN = ("gray", "", "Unknown", "Insufficient data for reliability estimate.")
+
+
 def get_reliability_score(mape_value):
     """
     Calculate reliability score based on MAPE.
     Returns: (color, emoji, label, advice)
     """
     if mape_value is None:
-        return ("gray", "", "Unknown", "Insufficient data for reliability estimate.")
-    elif mape_value < 15:
-        return ("green", "", "Excellent", "High reliability. Plan staffing normally.")
-    elif mape_value < 25:
-        return ("yellow", "", "Acceptable", "Good reliability. Consider a ±10% staffing buffer.")
-    elif mape_value < 40:
-        return (
-            "orange",
-            "",
-            "Monitor",
-            "Moderate variance. Plan for flexibility — have backup staff available.",
-        )
-    else:
-        return ("red", "", "Low reliability", f"High variance expected. Consider a wider staffing range.")
+        return _RELIABILITY_UNKNOWN
+    return _RELIABILITY_SCORES[bisect_right(_RELIABILITY_THRESHOLDS, mape_value)]
 
 
 def get_prediction_interval_text(interval, predicted):
@@ -118,64 +125,76 @@ def detect_drift(confidence, mape):
     return None
 
 
+# One factor row of the breakdown (immutable, so constant rows can be shared)
+Factor = namedtuple("Factor", "name icon value impact description")
+
+_RAIN_ICON = "🌧️"
+_RAIN_IMPACT = "-3"
+
+_NO_EVENTS_FACTOR = Factor(
+    name="Local events",
+    icon="📅",
+    value="None detected",
+    impact="±0",
+    description="No major events affecting predictions",
+)
+_DAY_PATTERN_FACTOR = Factor(
+    name="Day pattern",
+    icon="📆",
+    value="Typical for this day",
+    impact="±0",
+    description="Based on historical patterns for this weekday",
+)
+
+
 def get_factor_breakdown(reasoning: dict, predicted_covers: int) -> list:
     """
     Generate human-readable factor breakdown from reasoning data.
-    Returns list of factor dicts with name, impact, icon, description.
+    Returns list of Factor(name, icon, value, impact, description); use ._asdict() for dicts.
     """
     factors = []
     patterns = reasoning.get("similar_patterns", []) or reasoning.get("patterns_used", [])
     context = reasoning.get("context_summary", {})
 
     if patterns:
-        avg_pattern_covers = sum(p.get("actual_covers", 0) for p in patterns) / len(patterns)
+        avg_pattern_covers = reasoning.get("_avg_pattern_covers")
+        if avg_pattern_covers is None:
+            avg_pattern_covers = sum(p.get("actual_covers", 0) for p in patterns) / len(patterns)
         baseline_diff = predicted_covers - avg_pattern_covers
-        factors.append({
-            "name": "Historical baseline",
-            "icon": "📊",
-            "value": f"{avg_pattern_covers:.0f} covers",
-            "impact": f"{baseline_diff:+.0f}",
-            "description": f"Average of {len(patterns)} similar days",
-        })
+        factors.append(Factor(
+            name="Historical baseline",
+            icon="📊",
+            value=f"{avg_pattern_covers:.0f} covers",
+            impact=f"{baseline_diff:+.0f}",
+            description=f"Average of {len(patterns)} similar days",
+        ))
 
     weather = context.get("weather", {})
     if weather:
         weather_condition = weather.get("condition", "Clear")
-        weather_impact = -3 if "rain" in weather_condition.lower() else 0
-        if weather_impact != 0:
-            factors.append({
-                "name": "Weather",
-                "icon": "🌧️" if weather_impact < 0 else "☀️",
-                "value": weather_condition,
-                "impact": f"{weather_impact:+.0f}",
-                "description": "Rainy days typically reduce covers by 10%",
-            })
+        # Only rain ("Rain", "Heavy Rain", ...) moves the forecast
+        if "rain" in weather_condition.lower():
+            factors.append(Factor(
+                name="Weather",
+                icon=_RAIN_ICON,
+                value=weather_condition,
+                impact=_RAIN_IMPACT,
+                description="Rainy days typically reduce covers by 10%",
+            ))
 
     events = context.get("events", [])
     if events:
-        factors.append({
-            "name": "Local events",
-            "icon": "🎉",
-            "value": events[0] if events else "None",
-            "impact": "+2",
-            "description": "Events nearby can increase walk-ins",
-        })
+        factors.append(Factor(
+            name="Local events",
+            icon="🎉",
+            value=events[0],
+            impact="+2",
+            description="Events nearby can increase walk-ins",
+        ))
     else:
-        factors.append({
-            "name": "Local events",
-            "icon": "📅",
-            "value": "None detected",
-            "impact": "±0",
-            "description": "No major events affecting predictions",
-        })
-
-    factors.append({
-        "name": "Day pattern",
-        "icon": "📆",
-        "value": "Typical for this day",
-        "impact": "±0",
-        "description": "Based on historical patterns for this weekday",
-    })
+        factors.append(_NO_EVENTS_FACTOR)
+
+    factors.append(_DAY_PATTERN_FACTOR)
 
     return factors
 
@@ -195,6 +214,7 @@ def get_similar_day_context(patterns: list) -> dict:
     }
 
 
+@lru_cache(maxsize=256)
 def get_contextual_recommendation(
     predicted: int,
     range_low: int,
@@ -204,6 +224,9 @@ def get_contextual_recommendation(
 ) -> str:
     """Generate contextual, actionable recommendation (not generic)."""
     variance = range_high - range_low
+    servers_needed = predicted // 20
+    servers = max(2, servers_needed)
+    kitchen = max(1, predicted // 30)
 
     if predicted < breakeven:
         return f"""⚠️ **Below breakeven** ({breakeven} covers)
@@ -217,7 +240,7 @@ Expected revenue may not cover costs. Consider:
         return f"""📊 **Wide range expected** ({range_low}-{range_high} covers)
 
 Staffing strategy:
-- Schedule for {predicted} covers ({predicted // 20} servers)
+- Schedule for {predicted} covers ({servers_needed} servers)
 - Have 1 server on-call for flex
 - Kitchen prep for {range_high} (avoid 86s)"""
 
@@ -225,20 +248,20 @@ Staffing strategy:
         return f"""✅ **High confidence prediction**
 
 Plan normally for {predicted} covers:
-- {max(2, predicted // 20)} servers
+- {servers} servers
 - Standard prep levels
 - No special adjustments needed"""
 
     return f"""💡 **Plan for {predicted} covers** (range: {range_low}-{range_high})
 
-Staffing: {max(2, predicted // 20)} servers, {max(1, predicted // 30)} kitchen
+Staffing: {servers} servers, {kitchen} kitchen
 Buffer: Consider +1 server on-call if trending up"""
 
 
 def fetch_prediction(params: dict) -> dict:
     """Fetch a single prediction from API"""
     try:
-        response = requests.post(
+        response = SESSION.post(
             f"{API_URL}/predict",
             json=params,
             timeout=30,
@@ -257,21 +280,57 @@ def fetch_prediction(params: dict) -> dict:
         }
 
 
+def _fetch_batch(dates: list, service_type: str, restaurant_id: str) -> dict:
+    """One POST /predict/batch for all dates of a service. Returns {date: prediction}."""
+    response = SESSION.post(
+        f"{API_URL}/predict/batch",
+        json={
+            "dates": dates,
+            "service_type": service_type,
+            "restaurant_id": restaurant_id,
+        },
+        timeout=120,
+    )
+    response.raise_for_status()
+    return {p.get("date"): p for p in response.json().get("predictions", [])}
+
+
 def fetch_week_predictions(
     start_date: date, service_types: list, restaurant_id: str
 ) -> list:
-    """Fetch predictions for a week (7 days × service types)"""
-    requests_list = []
-    for day_offset in range(7):
-        current_date = start_date + timedelta(days=day_offset)
+    """Fetch predictions for a week (7 days × service types), one batch call per service"""
+    dates = [(start_date + timedelta(days=day_offset)).isoformat() for day_offset in range(7)]
+    requests_list = [
+        {
+            "restaurant_id": restaurant_id,
+            "service_date": current_date,
+            "service_type": service,
+        }
+        for current_date in dates
+        for service in service_types
+    ]
+
+    by_service = {}
+    try:
         for service in service_types:
-            requests_list.append({
-                "restaurant_id": restaurant_id,
-                "service_date": current_date.isoformat(),
-                "service_type": service,
+            by_service[service] = _fetch_batch(dates, service, restaurant_id)
+    except Exception:
+        # Batch endpoint unavailable: fall back to one request per day/service
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            return list(executor.map(fetch_prediction, requests_list))
+
+    results = []
+    for params in requests_list:
+        data = by_service[params["service_type"]].get(params["service_date"])
+        if data is None:
+            results.append({
+                "_params": params,
+                "_error": "Missing from batch response",
+                "predicted_covers": None,
+                "confidence": None,
             })
-
-    with ThreadPoolExecutor(max_workers=5) as executor:
-        results = list(executor.map(fetch_prediction, requests_list))
-
+            continue
+        data["_params"] = params
+        data["_error"] = None
+        results.append(data)
     return results
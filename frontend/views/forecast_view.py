@@ -6,6 +6,7 @@ from datetime import datetime, timedelta
 from typing import Optional
 
 from config import get_text, API_BASE
+from http_session import SESSION
 from components.header import render_header
 from components.loading_steps import (
     render_loading_steps,
@@ -20,7 +21,7 @@ from components.timeline_chart import (
     render_month_chart_from_data,
 )
 from components.feedback_panel import render_feedback_panel
-from components.factors_panel import render_factors_panel
+from components.factors_panel import render_factors_panel, precompute_pattern_stats
 
 
 def _confidence_label(confidence: float, lang: str) -> str:
@@ -76,19 +77,40 @@ def _render_kpi_cards_day(lang: str, prediction: dict, date_display: str) -> Non
         st.warning(f"Could not load prediction for {date_display}")
 
 
-def _render_kpi_cards_week(lang: str, week_predictions: list) -> None:
-    """Render KPI cards for week view (totals, peak, avg)."""
+def _week_summary(week_predictions: list) -> dict:
+    """Week aggregates in one pass: total, peak day, avg confidence, baseline (avg of non-zero days)."""
+    total = nonzero_total = nonzero_days = 0
+    confidence_total = 0
+    peak_day = week_predictions[0]
+    for p in week_predictions:
+        covers = p.get("covers", 0)
+        total += covers
+        if covers > 0:
+            nonzero_total += covers
+            nonzero_days += 1
+        if covers > peak_day.get("covers", 0):
+            peak_day = p
+        confidence_total += p.get("confidence", 0)
+    return {
+        "total": total,
+        "peak_day": peak_day,
+        "avg_confidence": confidence_total / len(week_predictions),
+        "baseline": nonzero_total / nonzero_days if nonzero_days else None,
+    }
+
+
+def _render_kpi_cards_week(lang: str, summary: Optional[dict]) -> None:
+    """Render KPI cards for week view (totals, peak, avg) from _week_summary."""
     col1, col2, col3, col4 = st.columns(4)
-    if not week_predictions:
+    if not summary:
         for col in [col1, col2, col3, col4]:
             with col:
                 st.metric("—", "—")
         return
-    total = sum(p.get("covers", 0) for p in week_predictions)
+    total = summary["total"]
     avg_covers = int(total / 7)
-    peak_day = max(week_predictions, key=lambda x: x.get("covers", 0))
-    confidences = [p.get("confidence", 0) for p in week_predictions]
-    avg_conf = sum(confidences) / len(confidences) if confidences else 0
+    peak_day = summary["peak_day"]
+    avg_conf = summary["avg_confidence"]
     with col1:
         st.metric(get_text("kpi.total_week", lang), f"{total} covers")
     with col2:
@@ -130,6 +152,22 @@ def _render_kpi_cards_month(
             st.metric(get_text("kpi.confidence", lang), "…")
 
 
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_predict(restaurant_id: str, service_date: str, service_type: str) -> dict:
+    """POST /predict, cached per (restaurant, date, service) across reruns. Errors are not cached."""
+    response = SESSION.post(
+        f"{API_BASE}/predict",
+        json={
+            "service_date": service_date,
+            "service_type": service_type,
+            "restaurant_id": restaurant_id,
+        },
+        timeout=60,
+    )
+    response.raise_for_status()
+    return response.json()
+
+
 def fetch_prediction(date: datetime, restaurant: str, service: str) -> dict:
     """Fetch prediction from backend API."""
     try:
@@ -141,18 +179,11 @@ def fetch_prediction(date: datetime, restaurant: str, service: str) -> dict:
         restaurant_id = restaurant_map.get(
             restaurant, restaurant.lower().replace(" ", "_")
         )
-        response = requests.post(
-            f"{API_BASE}/predict",
-            json={
-                "service_date": date.strftime("%Y-%m-%d"),
-                "service_type": service.lower(),
-                "restaurant_id": restaurant_id,
-            },
-            timeout=60,
+        return _cached_predict(
+            restaurant_id, date.date().isoformat(), service.lower()
         )
-        if response.status_code == 200:
-            return response.json()
-        st.warning(f"Prediction API returned status {response.status_code}")
+    except requests.exceptions.HTTPError as e:
+        st.warning(f"Prediction API returned status {e.response.status_code}")
     except requests.exceptions.ConnectionError:
         st.error("Unable to connect to backend API. Please ensure the backend is running.")
     except requests.exceptions.Timeout:
@@ -330,8 +361,8 @@ def render_forecast_view(context: dict) -> None:
     week_predictions = None
     month_predictions = None
 
-    # Optional cache for day view prediction
-    cache_key = f"{selected_date.strftime('%Y-%m-%d')}_{context['restaurant']}_{context['service']}"
+    # Optional cache for day view prediction (keyed on the date object, no string formatting per rerun)
+    cache_key = (selected_date.date(), context["restaurant"], context["service"])
     if "prediction_cache" not in st.session_state:
         st.session_state.prediction_cache = {}
 
@@ -349,6 +380,7 @@ def render_forecast_view(context: dict) -> None:
         steps[-1]["action"] = safe_fetch_day
         prediction = render_loading_steps(steps, lang=lang)
         if prediction is not None:
+            precompute_pattern_stats(prediction)
             st.session_state.prediction_cache[cache_key] = prediction
     elif view == "day":
         prediction = st.session_state.prediction_cache.get(cache_key)
@@ -362,7 +394,7 @@ def render_forecast_view(context: dict) -> None:
         week_start = selected_date - timedelta(days=selected_date.weekday())
         if "week_predictions_cache" not in st.session_state:
             st.session_state.week_predictions_cache = {}
-        week_cache_key = f"{week_start.strftime('%Y-%m-%d')}_{context['restaurant']}_{context['service']}"
+        week_cache_key = (week_start.date(), context["restaurant"], context["service"])
         if week_cache_key not in st.session_state.week_predictions_cache:
             steps = [dict(s) for s in WEEK_PREDICTION_STEPS]
             def safe_fetch_week():
@@ -380,7 +412,8 @@ def render_forecast_view(context: dict) -> None:
                 st.session_state.week_predictions_cache[week_cache_key] = week_predictions
         else:
             week_predictions = st.session_state.week_predictions_cache[week_cache_key]
-        _render_kpi_cards_week(lang, week_predictions or [])
+        week_summary = _week_summary(week_predictions) if week_predictions else None
+        _render_kpi_cards_week(lang, week_summary)
     else:
         month_predictions = None
         with st.spinner(get_text("loading.month", lang)):
@@ -401,14 +434,10 @@ def render_forecast_view(context: dict) -> None:
             st.info("Select a date to view forecast")
     elif view == "week":
         if week_predictions:
-            covers_list = [p["covers"] for p in week_predictions if p["covers"] > 0]
-            baseline = (
-                sum(covers_list) / len(covers_list) if covers_list else None
-            )
             render_week_chart(
                 predictions=week_predictions,
                 selected_date=selected_date,
-                baseline=baseline,
+                baseline=week_summary["baseline"],
                 lang=lang,
             )
         else:
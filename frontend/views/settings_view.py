@@ -1,9 +1,9 @@
 """Settings view - restaurant profile configuration."""
 
 import streamlit as st
-import requests
 
 from config import get_text, API_BASE
+from http_session import SESSION
 
 
 def render_settings_view(context: dict) -> None:
@@ -12,7 +12,7 @@ def render_settings_view(context: dict) -> None:
     st.title(get_text("nav.settings", lang))
 
     try:
-        response = requests.get(
+        response = SESSION.get(
             f"{API_BASE}/api/restaurant/profiles", timeout=5
         )
         profiles = response.json() if response.status_code == 200 else []
@@ -164,13 +164,13 @@ def render_settings_view(context: dict) -> None:
             }
             try:
                 if existing_profile:
-                    response = requests.put(
+                    response = SESSION.put(
                         f"{API_BASE}/api/restaurant/profile/{existing_profile['id']}",
                         json=profile_data,
                         timeout=10,
                     )
                 else:
-                    response = requests.post(
+                    response = SESSION.post(
                         f"{API_BASE}/api/restaurant/profile",
                         json=profile_data,
                         timeout=10,
@@ -189,7 +189,7 @@ def render_settings_view(context: dict) -> None:
 
     def _apply_defaults(restaurant_type: str):
         try:
-            resp = requests.get(
+            resp = SESSION.get(
                 f"{API_BASE}/api/restaurant/defaults/{restaurant_type}",
                 timeout=5,
             )
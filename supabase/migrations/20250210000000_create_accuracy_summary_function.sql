@@ -0,0 +1,20 @@
+-- Accuracy summary aggregated in the database (used by GET /api/accuracy/summary)
+-- Run this in Supabase SQL Editor: Dashboard > SQL Editor > New Query
+
+CREATE OR REPLACE FUNCTION accuracy_summary(days INTEGER DEFAULT 7)
+RETURNS TABLE (
+    feedbacks_count BIGINT,
+    avg_accuracy DOUBLE PRECISION,
+    within_range_pct DOUBLE PRECISION
+) AS $$
+    SELECT
+        count(*),
+        avg(accuracy_pct)::float8,
+        (avg(within_range::int) * 100)::float8
+    FROM user_feedback
+    WHERE accuracy_pct IS NOT NULL
+      AND created_at > NOW() - make_interval(days => accuracy_summary.days);
+$$ LANGUAGE sql STABLE;
+
+-- Speeds up the created_at window scan
+CREATE INDEX IF NOT EXISTS idx_user_feedback_created_at ON user_feedback(created_at);